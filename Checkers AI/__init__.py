@@ -1 +1 @@
-# Initiallization
+# Initiallization
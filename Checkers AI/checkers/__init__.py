@@ -1,2 +1,2 @@
-# Initialize the checkers folder as a package
-# Allow to import stuff directly from this package
+# Initialize the checkers folder as a package
+# Allow to import stuff directly from this package
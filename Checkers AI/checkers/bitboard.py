@@ -0,0 +1,65 @@
+# Bitboard helpers for the checkers board
+# Only the 32 dark squares can ever hold a piece => every dark square gets one bit of a 32-bit integer
+# bit index => row*4 + col//2 => row 0 uses bits 0-3, row 1 uses bits 4-7, ...., row 7 uses bits 28-31
+# even rows have their dark squares in columns 1, 3, 5, 7 and odd rows in columns 0, 2, 4, 6
+
+FULL = 0xFFFFFFFF               # all 32 dark squares
+
+EVEN_ROWS = 0x0F0F0F0F          # rows 0, 2, 4, 6
+ODD_ROWS = 0xF0F0F0F0           # rows 1, 3, 5, 7
+LEFT_EDGE = 0x10101010          # column 0 => only on odd rows
+RIGHT_EDGE = 0x08080808         # column 7 => only on even rows
+
+RED_CROWN = 0x0000000F          # row 0 => red pieces become kings here
+WHITE_CROWN = 0xF0000000        # row 7 => white pieces become kings here
+
+# Diagonal directions
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = 0, 1, 2, 3
+UP = (UP_LEFT, UP_RIGHT)                # red pieces move up the board
+DOWN = (DOWN_LEFT, DOWN_RIGHT)          # white pieces move down the board
+ALL_DIRECTIONS = UP + DOWN              # kings move both ways
+
+# Moving one square diagonally changes the bit index by a different amount on even and odd rows
+# direction => ((shift, squares that may use it), (shift, squares that may use it))
+# +ve shift => shift left (down the board), -ve shift => shift right (up the board)
+STEPS = (
+    ((-4, EVEN_ROWS), (-5, ODD_ROWS & ~LEFT_EDGE)),             # UP_LEFT
+    ((-3, EVEN_ROWS & ~RIGHT_EDGE), (-4, ODD_ROWS)),            # UP_RIGHT
+    ((4, EVEN_ROWS), (3, ODD_ROWS & ~LEFT_EDGE)),               # DOWN_LEFT
+    ((5, EVEN_ROWS & ~RIGHT_EDGE), (4, ODD_ROWS)),              # DOWN_RIGHT
+)
+
+# Opposite of every direction => used to find where a piece came from
+OPPOSITE = (DOWN_RIGHT, DOWN_LEFT, UP_RIGHT, UP_LEFT)
+
+
+# Move every square in 'mask' one step in 'direction' => squares falling off the board disappear
+def step(mask, direction):
+    (shift1, sources1), (shift2, sources2) = STEPS[direction]
+    if shift1 > 0:
+        return (((mask & sources1) << shift1) | ((mask & sources2) << shift2)) & FULL
+    return ((mask & sources1) >> -shift1) | ((mask & sources2) >> -shift2)
+
+
+# Count the number of set bits => number of pieces in a mask
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+# Split a mask into single-bit masks => one for every piece
+def bits(mask):
+    while mask:
+        bit = mask & -mask          # lowest set bit
+        yield bit
+        mask ^= bit
+
+
+# Convert (row, col) of a dark square to its bit and back
+def square_bit(row, col):
+    return 1 << (row*4 + col//2)
+
+
+def bit_square(bit):
+    index = bit.bit_length() - 1
+    row = index >> 2
+    return row, 2*(index & 3) + (1 - row%2)
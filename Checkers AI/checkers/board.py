@@ -1,247 +1,345 @@
-# Create and represent a checker board
-# all of different pieces moving
-# whose turn is it
-# moving, deleting, drawing specific pieces on the board
-
-import pygame
-
-# relative import
-from .constants import *
-from .piece import Piece
-
-class Board:
-    def __init__(self):
-        # Internal representation of the board
-        # where red and white pieces are stored in a 2D list => tell which piece is where => 8 diff element inside each list
-        self.board = []
-        # 2D array => [[Piece(), 0, Piece(), 0,....],
-        #              [0, Piece(), 0, Piece(),....],....]
-
-        # Number of red and white pieces
-        self.red_left = self.white_left = 12
-
-        # red kings = white kings = 0
-        self.red_kings = self.white_kings = 0
-        self.create_board()
-
-    # Draw red and black cubes on the window(win)
-    def draw_squares(self, win):
-
-        # fill entire window with black
-        win.fill(BLACK)
-
-        # Draw alternate red and black cubes on the board
-        for row in range(ROWS):
-            for col in range(row%2, COLS, 2):
-                pygame.draw.rect(win, RED, (row*SQUARE_SIZE, col*SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-
-        # row = 0 => row%2 = 0 => draw red square in column 0 => step by 2 => red square in column 2, 4, 6,..
-        # row = 1 => row%2 = 1 => draw red square in column 1 => step by 2 => red square in column 3, 5, 7,...
-        # row = 2 => row%2 = 0 => draw red square in column 0 => step by 2 => red square in column 2, 6, 6,...
-
-    # Create the pieces on board and add them to the list for internal representation of board
-    # White pieces at the top, Red pieces at the bottom
-    def create_board(self):
-        for row in range(ROWS):
-
-            # interior list for each row => contains what each row will have
-            self.board.append([])
-
-            for col in range(COLS):
-                # Draw the checkers alternatively
-                if(col%2 == (row+1)%2):
-                    if row<3:
-                        self.board[row].append(Piece(row, col, WHITE))          # Draw the white pieces in rows 0,1,2
-                    elif row>4:
-                        self.board[row].append(Piece(row, col, RED))            # Draw the red pieces in rows 5, 6, 7
-                    else:
-                        self.board[row].append(0)                               # Blank seperators - seperate the pieces - blank square
-                else:
-                    self.board[row].append(0)
-
-            # col = 0 and row = 0 => col%2 = 0 and (row+1)%2=1 => do not draw the piece on (0, 0)
-            # col = 1 and row = 0 => col%2 = 1 and (row+1)%2=1 => draw the piece on (0, 1)
-            # col = 0 and row = 1 => col%2 = 0 and (row+1)%2=0 => draw the piece on (1, 0)
-
-    # Draw pieces and the squares on the window 'win'
-    def draw(self, win):
-        self.draw_squares(win)
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-
-                # if piece is 0 => do not draw anything
-                if piece!=0:
-                    piece.draw(win)
-
-    # Swap the piece with other empty square
-    # Which piece you want to move and which row, col you want to move it to
-    def move(self, piece, row, col):
-        self.board[piece.row][piece.col], self.board[row][col] = self.board[row][col], self.board[piece.row][piece.col]
-
-        # Move the piece to row,col
-        piece.move(row, col)
-
-        # Check if we moved into a position where we become a king i.e. are in last row/first row
-        if row==ROWS-1 or row==0:
-            piece.make_king()
-            if piece.color == WHITE:
-                self.white_kings+=1
-            else:
-                self.red_kings+=1
-
-    # Remove piece/pieces
-    def remove(self, pieces):
-        for piece in pieces:
-            self.board[piece.row][piece.col] = 0
-            if piece!=0:
-                if piece.color==RED:
-                    self.red_left -= 1
-                else:
-                    self.white_left -= 1
-
-    # need to pass a piece object to the move() method
-    # write a method to get a piece
-    def get_piece(self, row, col):
-        return self.board[row][col]
-
-    def get_valid_moves(self, piece):
-        moves = {}                      # move => key, what place we can potentially move to as a (row, col)
-                                        #      => value => list of moves to get to the final move
-
-        # Diagonals to be considered
-        # What is left and what is right
-        left = piece.col - 1
-        right = piece.col + 1
-        row = piece.row
-
-        # moving the RED piece up the board
-        if piece.color==RED or piece.king:
-            # start => at row above the current row
-            # stop => row-3 => at most 2 above the current row
-            # step => -1 => move up when we increment/decrement the for loop
-            moves.update(self._traverse_left(row-1, max(row-3, -1), -1, piece.color, left))
-            moves.update(self._traverse_right(row-1, max(row-3, -1), -1, piece.color, right))
-
-        # moving the White piece down the board
-        if piece.color==WHITE or piece.king:
-            # start => at row below the current row
-            # stop => row+3 => at most 2 below the current row
-            # step => 1 => move down when we increment/decrement the for loop
-            moves.update(self._traverse_left(row+1, min(row+3, ROWS), 1, piece.color, left))
-            moves.update(self._traverse_right(row+1, min(row+3, ROWS), 1, piece.color, right))
-
-        return moves
-
-    # evaluate method => Calculate the score given the state of the board
-    # return a number(+ve/-ve) => tell the score of the board
-    def evaluate(self):
-        return self.white_left - self.red_left + (self.white_kings * 0.5 - self.red_kings * 0.5)
-
-    # Return the pieces that have the same color as the input
-    def get_all_pieces(self, color):
-        pieces = []
-        for row in self.board:
-            for piece in row:
-                if piece!=0 and piece.color==color:
-                    pieces.append(piece)
-        return pieces
-
-    # _traverse_left and _traverse_right => returns a dictionary
-    # move.update() => merges the dictionary with the current 'moves' dictionary to have as many things as we want
-
-    # Move on the left diagonal
-    # step => tells whether to go up or down while traversing through rows to the diagonals => top-left/top-right/bottom-left/bottom-right
-    # left => tells where are we starting in terms of column when traversing through the left
-    def _traverse_left(self, start, stop, step, color, left, skipped=[]):
-        moves = {}
-
-        # last => piece that we would skip to move to wherever we wanna go
-        last = []
-        for r in range(start, stop, step):
-            if left<0:                                  # Outside of the board
-                break
-            curr = self.board[r][left]
-
-            # Empty square
-            if(curr==0):
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, left)] = last+skipped
-
-                # if there is an empty space and last existed(had a value in it)
-                else:
-                    moves[(r, left)] = last
-
-                # if there is empty square and last exist
-                if last:
-                    if step==-1:
-                        row = max(r-3, 0)
-                    else:
-                        row = min(r+3, ROWS)
-
-                    moves.update(self._traverse_left(r+step, row, step, color, left-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, left+1, skipped=last))
-                break
-
-            # Same color piece as our current piece => then we cant move
-            elif(curr.color==color):
-                break
-            else:
-                # Other color => could potentially move over the top of it assuming empty square next
-                last=[curr]
-            left-=1
-
-        return moves
-
-    # Move on the right diagonal
-    def _traverse_right(self, start, stop, step, color, right, skipped=[]):
-        moves = {}
-
-        # last => piece that we would skip to move to wherever we wanna go
-        last = []
-        for r in range(start, stop, step):
-            if right>=COLS:                                  # Outside of the board
-                break
-            curr = self.board[r][right]
-
-            # Empty square
-            if(curr==0):
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last+skipped
-
-                # if there is an empty space and last existed(had a value in it)
-                else:
-                    moves[(r, right)] = last
-
-                # if there is empty square and last exist
-                if last:
-                    if step==-1:
-                        row = max(r-3, 0)
-                    else:
-                        row = min(r+3, ROWS)
-
-                    moves.update(self._traverse_left(r+step, row, step, color, right-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, right+1, skipped=last))
-                break
-
-            # Same color piece as our current piece => then we cant move
-            elif(curr.color==color):
-                break
-            else:
-                # Other color => could potentially move over the top of it assuming empty square next
-                last=[curr]
-            right+=1
-
-        return moves
-
-    def winner(self):
-        if self.red_left<=0:
-            return WHITE
-        elif self.white_left <= 0:
-            return RED
-
-        return None
+# Create and represent a checker board
+# all of different pieces moving
+# whose turn is it
+# moving and deleting specific pieces on the board
+# Pure python => no pygame needed, drawing the board is done by checkers.render
+
+# relative import
+from .constants import *
+from .piece import Piece
+from .bitboard import *
+from .movecache import MoveCache
+from . import zobrist
+
+class Board:
+    # Move lists of recent positions => shared by every board of this process, None turns the cache off
+    move_cache = MoveCache()
+
+    def __init__(self):
+        # Internal representation of the board => 3 bitboards (32-bit integers, one bit per dark square)
+        # red => squares holding a red piece, white => squares holding a white piece, kings => squares holding a king
+        self.red = self.white = self.kings = 0
+
+        # Zobrist hash of the pieces => kept up to date by every move, XOR zobrist.SIDE when white is to move
+        self.hash = 0
+
+        # Score of evaluate() => kept up to date by every move and capture instead of counting the pieces at every leaf
+        self.material = 0
+
+        # 2D list of Piece objects for drawing and for the Game => [[0, Piece(), 0, Piece(),....],....]
+        # built from the bitboards only when it is needed => the AI search never touches it
+        self._board = None
+        self.create_board()
+
+    # Number of red and white pieces and kings => counted straight from the bitboards
+    @property
+    def red_left(self):
+        return popcount(self.red)
+
+    @property
+    def white_left(self):
+        return popcount(self.white)
+
+    @property
+    def red_kings(self):
+        return popcount(self.red & self.kings)
+
+    @property
+    def white_kings(self):
+        return popcount(self.white & self.kings)
+
+    # 2D list of pieces => rebuilt from the bitboards if a move was applied without it
+    @property
+    def board(self):
+        if self._board is None:
+            self._board = [[0]*COLS for row in range(ROWS)]
+            for color, mask in ((RED, self.red), (WHITE, self.white)):
+                for bit in bits(mask):
+                    row, col = bit_square(bit)
+                    piece = Piece(row, col, color)
+                    if bit & self.kings:
+                        piece.make_king()
+                    self._board[row][col] = piece
+        return self._board
+
+    # Put the pieces on the bitboards
+    # White pieces at the top, Red pieces at the bottom
+    def create_board(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                # Only the dark squares hold pieces
+                if(col%2 == (row+1)%2):
+                    if row<3:
+                        self.white |= square_bit(row, col)          # white pieces in rows 0,1,2
+                    elif row>4:
+                        self.red |= square_bit(row, col)            # red pieces in rows 5, 6, 7
+        self.set_position(self.red, self.white, self.kings)
+
+    # Set up any position from its three bitboards => hash and material are computed from scratch
+    def set_position(self, red, white, kings):
+        self.red, self.white, self.kings = red, white, kings
+        self.hash = zobrist.hash_board(red, white, kings)
+        self.material = self.white_left - self.red_left + (self.white_kings * 0.5 - self.red_kings * 0.5)
+        self._board = None
+
+    # Cheap copy of the board => only the three integers are copied, no Piece objects
+    def copy(self):
+        board = Board.__new__(Board)
+        board.red, board.white, board.kings = self.red, self.white, self.kings
+        board.hash = self.hash
+        board.material = self.material
+        board._board = None
+        return board
+
+    # Swap the piece with other empty square
+    # Which piece you want to move and which row, col you want to move it to
+    def move(self, piece, row, col):
+        board = self.board
+        board[piece.row][piece.col], board[row][col] = board[row][col], board[piece.row][piece.col]
+        crowned = self._move_bits(square_bit(piece.row, piece.col), square_bit(row, col))
+
+        # Move the piece to row,col
+        piece.move(row, col)
+
+        # Check if we moved into a position where we become a king i.e. are in last row/first row
+        if crowned:
+            piece.make_king()
+
+    # Move the bits of a piece from square 'src' to square 'dst' => return True if the piece became a king
+    # the hash and the material only change for the piece that moved
+    def _move_bits(self, src, dst):
+        if self.red & src:
+            self.red = (self.red & ~src) | dst
+            crown, man, king, sign = RED_CROWN, zobrist.RED_MAN, zobrist.RED_KING, -1
+        else:
+            self.white = (self.white & ~src) | dst
+            crown, man, king, sign = WHITE_CROWN, zobrist.WHITE_MAN, zobrist.WHITE_KING, 1
+
+        keys = zobrist.KEYS
+        if self.kings & src:
+            self.kings = (self.kings & ~src) | dst
+            self.hash ^= keys[king][src] ^ keys[king][dst]
+        elif dst & crown:
+            self.kings |= dst
+            self.hash ^= keys[man][src] ^ keys[king][dst]
+            self.material += sign * 0.5
+            return True
+        else:
+            self.hash ^= keys[man][src] ^ keys[man][dst]
+        return False
+
+    # Remove piece/pieces
+    def remove(self, pieces):
+        for piece in pieces:
+            if piece!=0:
+                self.board[piece.row][piece.col] = 0
+                self._remove_bits(square_bit(piece.row, piece.col))
+
+    # Take the pieces on 'mask' off the board => XOR them out of the hash and subtract them from the material
+    def _remove_bits(self, mask):
+        keys = zobrist.KEYS
+        for bit in bits(mask & (self.red | self.white)):
+            if self.red & bit:
+                kind = zobrist.RED_KING if self.kings & bit else zobrist.RED_MAN
+                self.material += 1.5 if self.kings & bit else 1
+            else:
+                kind = zobrist.WHITE_KING if self.kings & bit else zobrist.WHITE_MAN
+                self.material -= 1.5 if self.kings & bit else 1
+            self.hash ^= keys[kind][bit]
+
+        self.red &= ~mask
+        self.white &= ~mask
+        self.kings &= ~mask
+
+    # need to pass a piece object to the move() method
+    # write a method to get a piece
+    def get_piece(self, row, col):
+        return self.board[row][col]
+
+    def get_valid_moves(self, piece):
+        moves = {}                      # move => key, what place we can potentially move to as a (row, col)
+                                        #      => value => list of pieces we jump over to get to the final move
+        board = self.board
+        square = square_bit(piece.row, piece.col)
+
+        # Moves of this piece out of the (cached) moves of its side => clicking around does not generate them again
+        for src, dst, captured in self.get_move_list(piece.color):
+            if src != square:
+                continue
+            skipped = [board[row][col] for row, col in map(bit_square, bits(captured))]
+
+            # Two jump sequences can end on the same square => keep the one capturing more pieces
+            if len(skipped) >= len(moves.get(bit_square(dst), ())):
+                moves[bit_square(dst)] = skipped
+
+        return moves
+
+    # evaluate method => Calculate the score given the state of the board
+    # return a number(+ve/-ve) => tell the score of the board
+    # white_left - red_left + (white_kings - red_kings) * 0.5 => maintained by the moves, so nothing is counted here
+    def evaluate(self):
+        return self.material
+
+    # Return the pieces that have the same color as the input
+    def get_all_pieces(self, color):
+        board = self.board
+        return [board[row][col] for row, col in map(bit_square, bits(self.red if color==RED else self.white))]
+
+    # All moves of one side as (src, dst, captured) => src and dst are single bits, captured is a mask of jumped pieces
+    # Works only on the bitboards => this is what the AI searches with
+    # forced => tournament rules: a capture must be taken if there is one and a multi-jump must be finished
+    # the list is a fresh copy => the caller may sort it, the cached one is never touched
+    # cache => False => generate the moves without looking in or filling the move cache (positions that will not come
+    # up again, like the random games of minimax.mcts, would only push the useful ones out of it)
+    def get_move_list(self, color, forced=False, cache=True):
+        cache = self.move_cache if cache else None
+        if cache is None:
+            return self._generate_moves(color, forced)
+
+        key = MoveCache.key(self, color==WHITE, forced)
+        moves = cache.get(key, self)
+        if moves is None:
+            moves = self._generate_moves(color, forced)
+            cache.put(key, self, moves)
+            return moves
+        return list(moves)
+
+    # Generate the moves for get_move_list() from the bitboards
+    def _generate_moves(self, color, forced):
+        if color==RED:
+            own, opponent, forward = self.red, self.white, UP
+        else:
+            own, opponent, forward = self.white, self.red, DOWN
+        empty = ~(self.red | self.white) & FULL
+        kings = own & self.kings
+
+        moves = []
+        slides = [] if forced else moves            # forced => keep the slides apart, they only count without captures
+        for direction in ALL_DIRECTIONS:
+            movers = own if direction in forward else kings
+
+            # Shift all the pieces at once => every square that can capture in this direction
+            jumpers = movers & step(step(empty, OPPOSITE[direction]) & opponent, OPPOSITE[direction])
+            for src in bits(jumpers):
+                self._traverse_jumps(src, src, (direction,), self._directions(src, color),
+                                     opponent, empty | src, 0, moves, not forced)
+
+            # Every empty square that a piece can slide into in this direction
+            for dst in bits(step(movers, direction) & empty):
+                slides.append((step(dst, OPPOSITE[direction]), dst, 0))
+
+        if forced and not moves:
+            return slides
+        return moves
+
+    # Only the captures of one side => complete multi-jumps, used by the quiescence search
+    def get_capture_list(self, color):
+        if color==RED:
+            own, opponent, forward = self.red, self.white, UP
+        else:
+            own, opponent, forward = self.white, self.red, DOWN
+        empty = ~(self.red | self.white) & FULL
+        kings = own & self.kings
+
+        moves = []
+        for direction in ALL_DIRECTIONS:
+            movers = own if direction in forward else kings
+            jumpers = movers & step(step(empty, OPPOSITE[direction]) & opponent, OPPOSITE[direction])
+            for src in bits(jumpers):
+                self._traverse_jumps(src, src, (direction,), self._directions(src, color),
+                                     opponent, empty | src, 0, moves, False)
+        return moves
+
+    # Kings move in all four directions, red pieces move up and white pieces move down
+    def _directions(self, src, color):
+        if src & self.kings:
+            return ALL_DIRECTIONS
+        return UP if color==RED else DOWN
+
+    # Follow a chain of jumps starting at 'bit' => return True if at least one jump was possible
+    # partial => every square we land on is a move of its own, multi-jumps may stop early just like before
+    #            otherwise only the squares where the chain ends are moves
+    # 'directions' are tried for this jump, 'next_directions' for the jumps after it
+    # Captured pieces stay on the board until the move is over => cannot be jumped twice or landed on
+    def _traverse_jumps(self, src, bit, directions, next_directions, opponent, empty, captured, moves, partial=True):
+        found = False
+        for direction in directions:
+            jumped = step(bit, direction) & opponent & ~captured
+            if jumped:
+                land = step(jumped, direction) & empty
+                if land:
+                    found = True
+
+                    # A king can capture the same pieces in a different order => same move, list it once
+                    move = (src, land, captured | jumped)
+                    if partial and move not in moves:
+                        moves.append(move)
+
+                    # A piece that becomes a king ends its move
+                    continued = False
+                    if next_directions is ALL_DIRECTIONS or not land & (RED_CROWN | WHITE_CROWN):
+                        continued = self._traverse_jumps(src, land, next_directions, next_directions,
+                                                         opponent, empty, captured | jumped, moves, partial)
+
+                    if not partial and not continued and move not in moves:
+                        moves.append(move)
+        return found
+
+    # Play a move from get_move_list() on the bitboards
+    # return what undo_move() needs to take it back => the three bitboards, the hash and the material before the move
+    # (captured pieces, a king promotion and every piece counter all live in them)
+    def apply_move(self, move):
+        src, dst, captured = move
+        red, white, kings, h, material = self.red, self.white, self.kings, self.hash, self.material
+        if red & src:
+            self.red = red & ~src | dst
+            self.white = white & ~captured
+            crown, man, king, enemy_man, enemy_king = RED_CROWN, zobrist.RED_MAN, zobrist.RED_KING, zobrist.WHITE_MAN, zobrist.WHITE_KING
+            sign = -1
+        else:
+            self.white = white & ~src | dst
+            self.red = red & ~captured
+            crown, man, king, enemy_man, enemy_king = WHITE_CROWN, zobrist.WHITE_MAN, zobrist.WHITE_KING, zobrist.RED_MAN, zobrist.RED_KING
+            sign = 1
+
+        # Update the hash => XOR out the piece on 'src' and every captured piece, XOR in the piece on 'dst'
+        # and the material => every captured man is worth 1 to the capturing side, every captured king 1.5
+        keys = zobrist.KEYS
+        score = material
+        for bit in bits(captured):
+            if kings & bit:
+                h ^= keys[enemy_king][bit]
+                score += sign * 1.5
+            else:
+                h ^= keys[enemy_man][bit]
+                score += sign
+
+        if kings & src:
+            self.kings = kings & ~captured & ~src | dst
+            h ^= keys[king][src] ^ keys[king][dst]
+        elif dst & crown:                                       # crowned => the man becomes a king worth 0.5 more
+            self.kings = kings & ~captured | dst
+            h ^= keys[man][src] ^ keys[king][dst]
+            score += sign * 0.5
+        else:
+            self.kings = kings & ~captured
+            h ^= keys[man][src] ^ keys[man][dst]
+
+        undo = (red, white, kings, self.hash, material)
+        self.hash, self.material = h, score
+        self._board = None
+        return undo
+
+    # Take back a move played with apply_move()
+    def undo_move(self, undo):
+        self.red, self.white, self.kings, self.hash, self.material = undo
+        self._board = None
+
+    # Empty bitboard => that side has no pieces left
+    def winner(self):
+        if not self.red:
+            return WHITE
+        elif not self.white:
+            return RED
+
+        return None
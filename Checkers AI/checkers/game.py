@@ -1,94 +1,165 @@
-# Interact with the board, checkers, etc
-# Responsible for Handling the game
-# Who's turn is it, did we select the piece, can we move the piece here and there
-
-import pygame
-from .constants import *
-from checkers.board import Board
-
-class Game:
-    def __init__(self, win):
-        self._init()
-        self.win = win
-
-    # Update pygame display using this method
-    def update(self):
-        self.board.draw(self.win)
-        self.draw_valid_moves(self.valid_moves)
-        pygame.display.update()
-
-    # Initilizing => private method init
-    def _init(self):
-        self.selected = None
-        self.board = Board()
-        self.turn = RED
-
-        # dictionary of valid possible moves that can be taken from a position
-        self.valid_moves = {}
-
-    # Reset the game
-    def reset(self):
-        self._init()
-
-    # Get the board
-    def get_board(self):
-        return self.board
-
-    # When select something => call the select method, tell the row and col selected and do something based on that
-    def select(self, row, col):
-
-        # Move the already selected piece to the desired row,col
-        if self.selected:
-            result = self._move(row, col)
-
-            # If incorrect/invalid move => reset the selection and reselect row and col
-            if not result:
-                self.selected = None
-                self.select(row, col)
-
-        piece = self.board.get_piece(row, col)
-
-        # not selecting an empty piece and the color of the piece is same as the turn
-        if piece!=0 and piece.color == self.turn:
-            self.selected = piece
-            self.valid_moves = self.board.get_valid_moves(piece)
-            return True
-
-        return False
-
-    # Move currently selected piece to the row and col
-    def _move(self, row, col):
-        piece = self.board.get_piece(row, col)
-
-        # If we have selected something and the piece that we selected is empty and the row, col is a valid move then we can move it
-        if self.selected and piece==0 and (row, col) in self.valid_moves:
-            self.board.move(self.selected, row, col)
-            skipped = self.valid_moves[(row, col)]
-            if skipped:
-                self.board.remove(skipped)
-            self.change_turn()
-        else:
-            return False
-
-        return True
-
-    # Change the turn after the move
-    def change_turn(self):
-        self.valid_moves = []
-        if self.turn==RED:
-            self.turn = WHITE
-        else:
-            self.turn = RED
-
-    def draw_valid_moves(self, moves):
-        for move in moves:
-            row, col = move
-            pygame.draw.circle(self.win, BLUE, (col*SQUARE_SIZE + SQUARE_SIZE//2, row*SQUARE_SIZE + SQUARE_SIZE//2), 15)
-
-    # When ai makes a move => return the new board after the move and update the board
-    def ai_move(self, board):
-        self.board = board
-        self.change_turn()
-
-    def winner(self):
-        return self.board.winner()
+# Interact with the board, checkers, etc
+# Responsible for Handling the game
+# Who's turn is it, did we select the piece, can we move the piece here and there
+# play() is the main loop of both games => Checkers (two people) and Checkers AI (a person against an engine)
+
+import pygame
+from .constants import *
+from .board import Board
+from .player import NO_MOVE
+from .render import BoardView
+
+# Take position of our mouse and based on that position will tell us which row/column we are in
+def get_row_col_from_mouse(pos):
+    x, y = pos
+    row = y//SQUARE_SIZE
+    col = x//SQUARE_SIZE
+    return row, col
+
+class Game:
+    def __init__(self, win):
+        self._init()
+        self.win = win
+        self.view = BoardView(win)
+
+    # Update pygame display using this method => only the parts of the window that changed are sent to the screen
+    def update(self):
+        rects = self.view.draw(self.board, self.valid_moves, self.stats)
+        if rects:
+            pygame.display.update(rects)
+
+    # Run the game until it is won or the window is closed => returns the winner (None if the window was closed)
+    # players => {RED: player, WHITE: player}, see checkers.player => people click, engines think away from the loop
+    def play(self, players, fps=60):
+        run = True
+        winner = None
+
+        # Make sure game doesn't run too fast or too slow
+        clock = pygame.time.Clock()
+
+        # Create an event loop while the game is running
+        while run:
+            clock.tick(fps)
+
+            player = players[self.turn]
+            if not player.interactive:
+                player.start(self.get_board())          # does nothing if the player is already thinking
+                new_board = player.get_move()
+                if new_board is NO_MOVE:
+                    self.resign()                       # nothing to play => the other side wins
+                elif new_board is not None:
+                    self.ai_move(new_board)             # Get the new board after the player has moved
+                    self.stats = getattr(player, "stats", None)
+
+            if self.winner() != None:
+                winner = self.winner()
+                run = False
+
+            # Check for any events happening at current time
+            for event in pygame.event.get():
+
+                # End the game and get rid of window by clicking the cross
+                if event.type == pygame.QUIT:
+                    run = False
+
+                # The window was covered and shown again => what it showed may be gone, so draw all of it
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.view.invalidate()
+
+                # If we press any button on mouse, we first get the row, column we are in
+                # Then we will select the piece on that location and move that to wherever we want to move
+                # Clicks only count while a person is to move
+                if event.type == pygame.MOUSEBUTTONDOWN and players[self.turn].interactive:
+                    row, col = get_row_col_from_mouse(pygame.mouse.get_pos())
+                    self.select(row, col)
+
+            self.update()
+
+        return winner
+
+    # Initilizing => private method init
+    def _init(self):
+        self.selected = None
+        self.board = Board()
+        self.turn = RED
+
+        # dictionary of valid possible moves that can be taken from a position
+        self.valid_moves = {}
+
+        # Summary of the last AI search (see minimax.stats) => drawn over the board, None => nothing drawn
+        self.stats = None
+
+        # Side that gave up (a player without a move to make) => the other side has won
+        self.resigned = None
+
+    # Reset the game
+    def reset(self):
+        self._init()
+
+    # Get the board
+    def get_board(self):
+        return self.board
+
+    # When select something => call the select method, tell the row and col selected and do something based on that
+    def select(self, row, col):
+
+        # Move the already selected piece to the desired row,col
+        if self.selected:
+            result = self._move(row, col)
+
+            # If incorrect/invalid move => reset the selection and reselect row and col
+            if not result:
+                self.selected = None
+                self.select(row, col)
+
+        piece = self.board.get_piece(row, col)
+
+        # not selecting an empty piece and the color of the piece is same as the turn
+        if piece!=0 and piece.color == self.turn:
+            self.selected = piece
+            self.valid_moves = self.board.get_valid_moves(piece)
+            return True
+
+        return False
+
+    # Move currently selected piece to the row and col
+    def _move(self, row, col):
+        piece = self.board.get_piece(row, col)
+
+        # If we have selected something and the piece that we selected is empty and the row, col is a valid move then we can move it
+        if self.selected and piece==0 and (row, col) in self.valid_moves:
+            self.board.move(self.selected, row, col)
+            skipped = self.valid_moves[(row, col)]
+            if skipped:
+                self.board.remove(skipped)
+            self.change_turn()
+        else:
+            return False
+
+        return True
+
+    # Change the turn after the move
+    def change_turn(self):
+        self.valid_moves = []
+        if self.turn==RED:
+            self.turn = WHITE
+        else:
+            self.turn = RED
+
+    # When ai makes a move => return the new board after the move and update the board
+    def ai_move(self, board):
+        self.board = board
+        self.change_turn()
+
+    # The side to move gives up the game
+    def resign(self):
+        self.resigned = self.turn
+
+    # The side to move loses when it has no pieces left or none of them can move => same rule as minimax.tournament
+    def winner(self):
+        if self.resigned != None:
+            return WHITE if self.resigned==RED else RED
+        winner = self.board.winner()
+        if winner == None and not self.board.get_move_list(self.turn):
+            winner = WHITE if self.turn==RED else RED
+        return winner
@@ -0,0 +1,61 @@
+# Move cache => remember the move lists of positions that were generated recently
+# The UI asks for the moves of the same position on every click, the search visits the same positions again on every
+# iteration of iterative deepening => look the list up instead of generating it again
+#
+# Bounded LRU cache keyed by the Zobrist hash, the side to move and the rules (forced captures or not)
+# entry => (red, white, kings, moves) => the bitboards are compared as well, so a hash collision is never a wrong list
+# A move or a capture changes the hash => the position gets a new key and the old entry simply stops being asked for
+#
+# One cache (Board.move_cache) is shared by every board of the process => searches in other threads (protocol sessions,
+# AIPlayer without a process) use it at the same time, so every lookup and store holds the lock
+
+import threading
+from collections import OrderedDict
+
+from .zobrist import SIDE
+
+class MoveCache:
+    # size => most positions kept, the least recently used one is dropped first
+    def __init__(self, size=16384):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Key of a position => white_to_move and forced are booleans
+    @staticmethod
+    def key(board, white_to_move, forced):
+        return (board.hash ^ SIDE if white_to_move else board.hash) << 1 | forced
+
+    # Stored moves (a tuple) of the position or None
+    def get(self, key, board):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == board.red and entry[1] == board.white and entry[2] == board.kings:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry[3]
+            self.misses += 1
+            return None
+
+    def put(self, key, board, moves):
+        entry = (board.red, board.white, board.kings, tuple(moves))
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    # Fraction of lookups that found their position
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
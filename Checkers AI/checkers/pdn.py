@@ -0,0 +1,181 @@
+# PDN (Portable Draughts Notation) => the usual text format for checkers games
+#
+# [Event "..."]                 <= headers
+# 1. 11-15 23-19 2. 8-11 22-17 ...  1-0      <= move text, "-" for a move and "x" for a capture, then the result
+#
+# Squares are numbered 1-32 => 1-4 is the back row of the side that moves first (red in this game), 29-32 is the other back row
+# Seen from our board (red at the bottom): square 1 is (7, 6), square 4 is (7, 0), square 32 is (0, 1)
+
+import re
+
+from .bitboard import bit_square, square_bit
+from .constants import RED, WHITE
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_token = re.compile(r"\{[^}]*\}|\([^)]*\)|\[[^\]]*\]|[^\s{(\[]+")
+_header = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+
+# PDN square number => single bit of our board and back
+# only 1..32 are squares => anything else would turn into a shift by a negative or too large count
+def square_to_bit(number):
+    if not 1 <= number <= 32:
+        raise ValueError("square %d is not between 1 and 32" % number)
+    r, i = divmod(number - 1, 4)
+    col = 2*i + 1 if r%2==0 else 2*i
+    return square_bit(7 - r, 7 - col)
+
+def bit_to_square(bit):
+    row, col = bit_square(bit)
+    r, c = 7 - row, 7 - col
+    return r*4 + c//2 + 1
+
+# "11-15" => [11, 15], "9x18x27" => [9, 18, 27]
+def parse_move(text):
+    numbers = re.split("[-x]", text)
+    if len(numbers) < 2 or not all(number.isdigit() for number in numbers):
+        raise ValueError("bad move %r" % text)
+    return [int(number) for number in numbers]
+
+# Find the move of 'color' that goes along the PDN 'squares' => None if it is not legal
+def find_move(board, color, squares):
+    src, dst = square_to_bit(squares[0]), square_to_bit(squares[-1])
+    candidates = [move for move in board.get_move_list(color) if move[0] == src and move[1] == dst]
+    if not candidates:
+        return None
+
+    # A capture written with every landing square ("9x18x27") takes one piece per jump
+    jumps = len(squares) - 1
+    for move in candidates:
+        if move[2] and bin(move[2]).count("1") == jumps:
+            return move
+    return max(candidates, key=lambda move: bin(move[2]).count("1"))
+
+# Move => PDN text
+def move_text(move):
+    src, dst, captured = move
+    return "%d%s%d" % (bit_to_square(src), "x" if captured else "-", bit_to_square(dst))
+
+# FEN => a position as text, "B:W21,22,K30:B1,2,K5" => side to move, then the pieces of each side ("K" => king)
+# B is the side that moves first (red in this game), W the other one (white)
+def parse_fen(text):
+    from .board import Board
+
+    fields = text.strip().strip('"').split(":")
+    # side to move => exactly "B" or "W" ("" and "BW" would pass a plain 'in "BW"')
+    if len(fields) != 3 or fields[0].upper() not in ("B", "W"):
+        raise ValueError("bad FEN %r" % text)
+    masks = {"B": [0, 0], "W": [0, 0]}              # side => [pieces, kings]
+    for field in fields[1:]:
+        side, squares = field[:1].upper(), field[1:]
+        if side not in masks:
+            raise ValueError("bad FEN %r" % text)
+        for square in filter(None, squares.split(",")):
+            king = square[0].upper() == "K"
+            number = square[1:] if king else square
+            if not number.isdigit():
+                raise ValueError("bad FEN %r" % text)
+            bit = square_to_bit(int(number))
+            masks[side][0] |= bit
+            if king:
+                masks[side][1] |= bit
+
+    board = Board()
+    board.set_position(masks["B"][0], masks["W"][0], masks["B"][1] | masks["W"][1])
+    return board, RED if fields[0].upper() == "B" else WHITE
+
+def fen(board, color):
+    def side(letter, mask):
+        squares = sorted((bit_to_square(1 << i), mask >> i & 1 and board.kings >> i & 1) for i in range(32) if mask >> i & 1)
+        return letter + ",".join(("K%d" if king else "%d") % square for square, king in squares)
+    return ":".join(("B" if color==RED else "W", side("W", board.white), side("B", board.red)))
+
+# Read games one at a time from an iterable of lines (an open file) => never holds more than one game in memory
+# yields (headers, moves, result) => moves are PDN texts like "11-15"
+def read_games(lines):
+    headers, moves = {}, []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # A header after move text => the previous game ended without a result
+        if line.startswith("[") and moves:
+            yield headers, moves, "*"
+            headers, moves = {}, []
+
+        for token in _token.findall(line):
+            if token.startswith("["):
+                match = _header.match(token)
+                if match:
+                    headers[match.group(1)] = match.group(2)
+            elif token.startswith("{") or token.startswith("("):
+                continue                # comments and variations
+            elif token in RESULTS:
+                yield headers, moves, token
+                headers, moves = {}, []
+            elif re.match(r"^\d+\.+$", token):
+                continue                # move numbers
+            else:
+                # "15." glued to a move, or a move followed by "!" / "?"
+                token = re.sub(r"^\d+\.+", "", token).rstrip("!?*")
+                if re.match(r"^\d+([-x]\d+)+$", token):
+                    moves.append(token)
+
+    if moves:
+        yield headers, moves, "*"
+
+# Position a game starts from => its FEN header, or the usual starting position
+def start_position(headers):
+    from .board import Board
+
+    if "FEN" in headers:
+        return parse_fen(headers["FEN"])
+    return Board(), RED
+
+# Replay the PDN moves of a game => yields (board, color to move, move) before every move is played
+# stops at the first move that is not legal on the board (or names a square that does not exist)
+def replay(moves, board=None, color=RED):
+    from .board import Board
+
+    board = board if board is not None else Board()
+    for text in moves:
+        try:
+            move = find_move(board, color, parse_move(text))
+        except ValueError:
+            return
+        if move is None:
+            return
+        yield board, color, move
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+
+# Write one game => comments (optional) has one text per move, written after it in braces (None => no comment)
+# color => side that makes the first move => a game that starts with white to move is numbered "1..."
+def write_game(f, headers, moves, result="*", comments=None, color=RED):
+    for name, value in headers.items():
+        f.write('[%s "%s"]\n' % (name, value))
+    if headers:
+        f.write("\n")
+
+    tokens = []
+    offset = 0 if color==RED else 1
+    for ply, text in enumerate(moves, offset):
+        if ply % 2 == 0:
+            tokens.append("%d." % (ply//2 + 1))
+        elif ply == offset:
+            tokens.append("%d..." % (ply//2 + 1))
+        tokens.append(text)
+        if comments and comments[ply - offset]:
+            tokens.append("{%s}" % comments[ply - offset].replace("}", ")"))
+    tokens.append(result)
+
+    # Lines of at most 80 characters => a comment can be read back only if it stays on one line, so it is never split
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            f.write(line + "\n")
+            line = token
+        else:
+            line = line + " " + token if line else token
+    f.write(line + "\n\n")
@@ -0,0 +1,83 @@
+# Perft => count every position reachable in exactly 'depth' moves
+# Checks the move generator (the counts must match known numbers) and measures how fast it is
+#
+# python -m checkers.perft [depth] [--optional-captures]
+# prints the divide (count below every first move) and the total for depths 1..depth with moves/sec
+#
+# Published counts (English draughts, red moves first, captures forced) are for tournament rules =>
+# get_move_list(color, forced=True). The game itself lets captures be skipped and multi-jumps stop early,
+# which gives bigger numbers => use --optional-captures to count those
+
+import time
+
+from .board import Board
+from .bitboard import bit_square
+from .constants import RED, WHITE
+
+# Known perft counts from the starting position with forced captures
+PUBLISHED = {
+    1: 7,
+    2: 49,
+    3: 302,
+    4: 1469,
+    5: 7361,
+    6: 36768,
+    7: 179740,
+    8: 845931,
+    9: 3963680,
+    10: 18391564,
+    11: 85242128,
+    12: 388623673,
+}
+
+# Number of positions 'depth' moves below this one, 'color' to move
+def perft(board, depth, color, forced=True):
+    moves = board.get_move_list(color, forced)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1      # bulk counting => no need to play the last moves
+
+    other = WHITE if color==RED else RED
+    nodes = 0
+    for move in moves:
+        undo = board.apply_move(move)
+        nodes += perft(board, depth-1, other, forced)
+        board.undo_move(undo)
+    return nodes
+
+# Perft split by first move => {move: count} => compare with another generator to find the move that differs
+def divide(board, depth, color, forced=True):
+    other = WHITE if color==RED else RED
+    counts = {}
+    for move in board.get_move_list(color, forced):
+        undo = board.apply_move(move)
+        counts[move] = perft(board, depth-1, other, forced)
+        board.undo_move(undo)
+    return counts
+
+# Readable form of a move => "(5, 0)-(4, 1)" or "(5, 0)x(3, 2)"
+def move_name(move):
+    src, dst, captured = move
+    return "%s%s%s" % (bit_square(src), "x" if captured else "-", bit_square(dst))
+
+if __name__ == "__main__":
+    import sys
+
+    forced = "--optional-captures" not in sys.argv
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    depth = int(args[0]) if args else 7
+
+    # Measure the move generator itself => with the move cache the repeated depths would only be lookups
+    Board.move_cache = None
+    board = Board()
+    for move, count in sorted(divide(board, depth, RED, forced).items(), key=lambda item: bit_square(item[0][0])):
+        print("%-16s %d" % (move_name(move), count))
+    print()
+
+    for d in range(1, depth + 1):
+        start = time.time()
+        nodes = perft(board, d, RED, forced)
+        elapsed = time.time() - start
+        check = ""
+        if forced and d in PUBLISHED:
+            check = "ok" if nodes == PUBLISHED[d] else "EXPECTED %d" % PUBLISHED[d]
+        print("depth %2d: %12d positions  %7.2fs  %10.0f moves/sec  %s" % (d, nodes, elapsed, nodes / elapsed if elapsed else 0, check))
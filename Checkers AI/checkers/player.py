@@ -0,0 +1,32 @@
+# Players => who makes the moves of one color, so Game.play() can run any mix of people and engines
+# No pygame in here => engines (minimax.player.AIPlayer) build on it without a display
+#
+#   interactive  => True => the moves come from clicks on the window (Game.select())
+#   start(board) => it is this player's turn on 'board' => start thinking, returns at once
+#   get_move()   => the board after the move once it is ready, None while still thinking, NO_MOVE when the side
+#                   to move has no legal move (it has lost, see Game.winner())
+#   shutdown()   => stop thinking and free what the player holds => called once when the game is over
+#
+# Another engine only has to subclass Player and fill in start() and get_move()
+
+# Answer of get_move() when there is no move to make => kept apart from None, which means "still thinking"
+NO_MOVE = "no move"
+
+class Player:
+    interactive = False
+
+    def __init__(self, color):
+        self.color = color
+
+    def start(self, board):
+        pass
+
+    def get_move(self):
+        return None
+
+    def shutdown(self):
+        pass
+
+# A person at the window => every move is made with the mouse
+class HumanPlayer(Player):
+    interactive = True
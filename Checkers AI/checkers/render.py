@@ -0,0 +1,189 @@
+# Draw the board and the pieces with pygame
+# Kept apart from the rules => only the game window imports pygame, the engine never does
+#
+# Nothing is drawn twice if it did not change:
+# - the checkerboard is drawn once to a surface and copied (blitted) from there
+# - every kind of piece (red/white, man/king) is drawn once to a sprite
+# - BoardView remembers what the window shows => a frame only redraws the squares that changed and hands just their
+#   rectangles to pygame.display.update() => an idle window costs almost nothing
+
+import os
+
+import pygame
+
+from .bitboard import bits, bit_square, square_bit
+from .constants import *
+
+# padding for the checker circle in the middle of the squares
+PADDING = 15
+
+# outline of the circle
+BORDER = 2
+
+# Crown image for the king pieces => loaded the first time a king is drawn
+_crown = None
+
+def get_crown():
+    global _crown
+    if _crown is None:
+        # load crown image for placing on the king piece => scale the image(keeping the aspect ratio reserved)
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'king.png')
+        _crown = pygame.transform.scale(pygame.image.load(path), (44, 25))
+    return _crown
+
+# Same pixel format as the window => blitting does not have to convert every pixel (only possible once it exists)
+def _converted(surface):
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+
+# Draw red and black cubes on the window(win)
+def draw_squares(win):
+
+    # fill entire window with black
+    win.fill(BLACK)
+
+    # Draw alternate red and black cubes on the board
+    for row in range(ROWS):
+        for col in range(row%2, COLS, 2):
+            pygame.draw.rect(win, RED, (row*SQUARE_SIZE, col*SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+
+    # row = 0 => row%2 = 0 => draw red square in column 0 => step by 2 => red square in column 2, 4, 6,..
+    # row = 1 => row%2 = 1 => draw red square in column 1 => step by 2 => red square in column 3, 5, 7,...
+    # row = 2 => row%2 = 0 => draw red square in column 0 => step by 2 => red square in column 2, 6, 6,...
+
+# Empty checkerboard => drawn the first time it is needed
+_background = None
+
+def get_background():
+    global _background
+    if _background is None:
+        _background = pygame.Surface((WIDTH, HEIGHT))
+        draw_squares(_background)
+        _background = _converted(_background)
+    return _background
+
+# Piece sprites => (color, king) => one square sized, transparent surface with the piece in the middle
+_sprites = {}
+
+def get_sprite(color, king):
+    sprite = _sprites.get((color, king))
+    if sprite is None:
+        sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        center = (SQUARE_SIZE//2, SQUARE_SIZE//2)
+        radius = SQUARE_SIZE//2 - PADDING
+
+        # Larger grey circle => the border, smaller circle of the piece color inside it
+        pygame.draw.circle(sprite, GREY, center, radius + BORDER)
+        pygame.draw.circle(sprite, color, center, radius)
+
+        # Draw the king image on the piece
+        if king:
+            crown = get_crown()
+            sprite.blit(crown, (center[0] - crown.get_width()//2, center[1] - crown.get_height()//2))
+
+        sprite = _sprites[(color, king)] = _converted(sprite)
+    return sprite
+
+# Blue dot on a square a selected piece can move to
+def draw_valid_move(win, row, col):
+    pygame.draw.circle(win, BLUE, (col*SQUARE_SIZE + SQUARE_SIZE//2, row*SQUARE_SIZE + SQUARE_SIZE//2), 15)
+
+# Keeps the window in step with the game by redrawing only what changed since the last frame
+class BoardView:
+    def __init__(self, win):
+        self.win = win
+        self.invalidate()
+
+    # Forget what the window shows => the next draw() redraws all of it
+    def invalidate(self):
+        self.shown = None               # (red, white, kings, valid move squares) as bitboards
+        self.stats = None               # stats drawn by the overlay
+        self.overlay = None             # rect covered by the overlay
+
+    # Bring the window up to date => returns the rects that changed, for pygame.display.update()
+    def draw(self, board, valid_moves, stats=None):
+        markers = 0
+        for row, col in valid_moves:
+            markers |= square_bit(row, col)
+        state = (board.red, board.white, board.kings, markers)
+
+        shown, self.shown = self.shown, state
+        if shown is None:
+            self.win.blit(get_background(), (0, 0))
+            for bit in bits(board.red | board.white | markers):
+                self._draw_piece(bit)
+            self.stats = stats
+            self.overlay = draw_stats(self.win, stats) if stats is not None else None
+            return [self.win.get_rect()]
+
+        if state == shown and stats is self.stats:
+            return []
+
+        # Squares whose piece or marker changed
+        changed = 0
+        for old, new in zip(shown, state):
+            changed |= old ^ new
+        rects = [self._draw_square(*bit_square(bit)) for bit in bits(changed)]
+
+        # The overlay is drawn last => redraw it if its text changed or a square under it was redrawn
+        if stats is not self.stats or (self.overlay and self.overlay.collidelist(rects) != -1):
+            if self.overlay:
+                rects.append(self._restore(self.overlay))
+            self.overlay = draw_stats(self.win, stats) if stats is not None else None
+            if self.overlay:
+                rects.append(self.overlay)
+            self.stats = stats
+        return rects
+
+    # Piece and/or valid move marker of one dark square, drawn over whatever is there
+    def _draw_piece(self, bit):
+        red, white, kings, markers = self.shown
+        row, col = bit_square(bit)
+        if bit & (red | white):
+            self.win.blit(get_sprite(RED if bit & red else WHITE, bool(bit & kings)), (col*SQUARE_SIZE, row*SQUARE_SIZE))
+        if bit & markers:
+            draw_valid_move(self.win, row, col)
+
+    # Redraw one square from scratch => its rect
+    def _draw_square(self, row, col):
+        rect = pygame.Rect(col*SQUARE_SIZE, row*SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+        self.win.blit(get_background(), rect, rect)
+        if (row + col) % 2:
+            self._draw_piece(square_bit(row, col))
+        return rect
+
+    # Redraw every square under 'area' => the rect of those squares
+    def _restore(self, area):
+        rows = range(area.top // SQUARE_SIZE, min(ROWS, (area.bottom - 1) // SQUARE_SIZE + 1))
+        cols = range(area.left // SQUARE_SIZE, min(COLS, (area.right - 1) // SQUARE_SIZE + 1))
+        rects = [self._draw_square(row, col) for row in rows for col in cols]
+        return rects[0].unionall(rects)
+
+# Font of the search statistics overlay => created the first time it is drawn
+_font = None
+
+def get_font():
+    global _font
+    if _font is None:
+        pygame.font.init()
+        _font = pygame.font.Font(None, 22)
+    return _font
+
+# Draw the statistics of the last AI search (a minimax.stats summary dict) in the top left corner => the rect it covers
+def draw_stats(win, stats):
+    lines = [
+        "depth %s   nodes %s   %s ms" % (stats["depth"], stats["nodes"], stats["time_ms"]),
+        "%s nodes/s   tt hits %s   cutoffs %s" % (stats["nps"], stats["tt_hit_rate"], stats["cutoffs"]),
+        "branching %s   score %s" % (stats["branching"], stats["score"]),
+        "pv " + " ".join(stats["pv"]),
+    ]
+    font = get_font()
+    surfaces = [font.render(line, True, WHITE) for line in lines]
+
+    # Half transparent black panel behind the text => the board stays visible under it
+    panel = pygame.Surface((max(surface.get_width() for surface in surfaces) + 10, 18*len(lines) + 6), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 160))
+    for i, surface in enumerate(surfaces):
+        panel.blit(surface, (5, 4 + 18*i))
+    return win.blit(panel, (0, 0))
@@ -0,0 +1,31 @@
+# Zobrist hashing => turn a position into one 64-bit number
+# Every (piece type, square) pair gets a random 64-bit key => the hash of a position is the XOR of the keys of all
+# its pieces, XOR the SIDE key when white is to move
+# Moving a piece only XORs out its old key and XORs in its new key => the hash is updated without looking at the board
+
+import random
+
+from .bitboard import bits
+
+# Piece types
+RED_MAN, RED_KING, WHITE_MAN, WHITE_KING = 0, 1, 2, 3
+
+# Fixed seed => the same position gets the same hash in every run (needed for anything saved to disk)
+_random = random.Random(20201031)
+
+# KEYS[piece type] => {square bit: key}
+KEYS = [{1 << square: _random.getrandbits(64) for square in range(32)} for kind in range(4)]
+
+# XOR this in when white is the side to move
+SIDE = _random.getrandbits(64)
+
+
+# Hash of a whole position from its bitboards => used when a board is set up, moves update it incrementally
+def hash_board(red, white, kings):
+    h = 0
+    for kind, mask in ((RED_MAN, red & ~kings), (RED_KING, red & kings),
+                       (WHITE_MAN, white & ~kings), (WHITE_KING, white & kings)):
+        keys = KEYS[kind]
+        for bit in bits(mask):
+            h ^= keys[bit]
+    return h
@@ -1,66 +1,62 @@
-import pygame
-
-# import all the constants from the constants package
-from checkers.constants import *
-
-# import the class "Board"
-from checkers.board import Board
-from checkers.game import Game
-
-from minimax.algorithm import minimax
-
-# Frames per second => for rendering and drawing the game
-FPS = 60
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-
-# Name of the game displayed on bar
-pygame.display.set_caption("Checkers")
-
-# Take position of our mouse and based on that position will tell us which row/column we are in
-def get_row_col_from_mouse(pos):
-    x, y = pos
-    row = y//SQUARE_SIZE
-    col = x//SQUARE_SIZE
-    return row, col
-
-# function to actually run the game
-def main():
-    run = True
-
-    # Make sure game doesn't run too fast or too slow
-    clock = pygame.time.Clock()
-
-    # Create a Game object which will control the board for us
-    game = Game(WIN)
-
-    # Create an event loop while the game is running
-    while run:
-        clock.tick(FPS)
-
-        if game.turn == WHITE:
-            value, new_board = minimax(game.get_board(), 3, WHITE, game)
-            game.ai_move(new_board)             # Get the new board after the ai has moved
-
-        if game.winner() != None:
-            print(game.winner())
-            run = False
-
-        # Check for any events happening at current time
-        for event in pygame.event.get():
-
-            # End the game and get rid of window by clicking the cross
-            if event.type == pygame.QUIT:
-                run = False
-
-            # If we press any button on mouse, we first get the row, column we are in
-            # Then we will select the piece on that location and move that to wherever we want to move
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
-                row, col = get_row_col_from_mouse(pos)
-                game.select(row, col)
-
-        game.update()
-
-    pygame.quit()
-
-main()
+import os
+
+import pygame
+
+# import all the constants from the constants package
+from checkers.constants import *
+
+from checkers.game import Game
+from checkers.player import HumanPlayer
+
+from minimax.player import AIPlayer
+
+# Frames per second => for rendering and drawing the game
+FPS = 60
+
+# Time the AI may think about one move (milliseconds) => it searches as deep as it can within it
+AI_TIME = 1000
+
+# Engine the AI thinks with => "alphabeta" or "mcts" (see minimax.engine)
+AI_ENGINE = "alphabeta"
+
+# Show the statistics of the AI's last search over the board => AI_LOG => also append them to this JSON-lines file
+AI_STATS = False
+AI_LOG = None
+
+# Evaluation weights written by "python -m minimax.tuner tune" => used when the file exists
+WEIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.json")
+
+# Opening book built with "python -m minimax.book" => used when the file exists
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# Endgame tablebases built with "python -m minimax.tablebase" => used when the directory exists
+TABLEBASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase")
+
+# function to actually run the game
+def main():
+    # The window is only created here => the AI worker process imports this file too and must not open one
+    win = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    # Name of the game displayed on bar
+    pygame.display.set_caption("Checkers")
+
+    # Create a Game object which will control the board for us
+    game = Game(win)
+
+    # A person plays red with the mouse, the AI plays white in a separate process => the window keeps drawing and
+    # reacting while it searches
+    ai = AIPlayer(WHITE, AI_TIME, book=BOOK if os.path.exists(BOOK) else None,
+                  tablebase=TABLEBASE if os.path.isdir(TABLEBASE) else None, engine=AI_ENGINE,
+                  weights=WEIGHTS if os.path.exists(WEIGHTS) else None, stats=AI_STATS, log=AI_LOG)
+    players = {RED: HumanPlayer(RED), WHITE: ai}
+
+    winner = game.play(players, FPS)
+    if winner != None:
+        print(winner)
+
+    for player in players.values():
+        player.shutdown()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
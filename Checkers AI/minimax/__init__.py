@@ -1 +1 @@
-# Make the minimax a package and import this package to use in other codes
+# Make the minimax a package and import this package to use in other codes
@@ -1,85 +1,81 @@
-from copy import deepcopy
-# Shallow copy => creates a new copy which stores reference of original element => copies reference of nested objects
-# Changing the original element => also changes the element in the shallow copy
-# old_list = [[1, 1, 1], [2, 2, 2], [3, 3, 3]] => [[1, 1, 1], [2, 'AA', 2], [3, 3, 3]]
-# new_list = [[1, 1, 1], [2, 2, 2], [3, 3, 3]] => [[1, 1, 1], [2, 'AA', 2], [3, 3, 3]]
-
-# Deep copy => create a new copy and recursively add copies of nested objects present in original element
-# Changing the original element => no change to the element in the deep copy
-# old_list = [[1, 1, 1], [2, 2, 2], [3, 3, 3]] => [[1, 1, 1], [2, 'AA', 2], [3, 3, 3]]
-# new_list = [[1, 1, 1], [2, 2, 2], [3, 3, 3]] => [[1, 1, 1], [2, 2, 2], [3, 3, 3]]
-
-import pygame
-
-RED = (255, 0, 0)
-WHITE = (255, 255, 255)
-
-# position => current position
-# pass the current board in the minimax algorithm => get the best board after those positions
-# depth => depth of the tree => how far extending the tree
-# max_player => boolean => whether minimizing the value or maximizing the value
-# game => game object
-def minimax(position, depth, max_player, game):
-    if depth==0 or position.winner() != None:               # depth = 0 => last node in the tree or game over => no need to continue
-        return position.evaluate(), position
-
-    # maximize the score
-    if max_player:
-        maxEval = float('-inf')
-        best_move = None                # store the best move we can make
-
-        # for every single move that we can potentially make => evaluate that move
-        for move in get_all_moves(position, WHITE, game):
-            evaluation = minimax(move, depth-1, False, game)[0]
-            maxEval = max(maxEval, evaluation)          # is the move better than move that we already have
-            if maxEval==evaluation:
-                best_move = move
-        return maxEval, best_move
-
-    # minimize the score
-    else:
-        minEval = float('inf')
-        best_move = None                # store the best move we can make
-
-        # for every single move that we can potentially make => evaluate that move
-        for move in get_all_moves(position, RED, game):
-            evaluation = minimax(move, depth-1, True, game)[0]
-            minEval = min(minEval, evaluation)          # is the move better than move that we already have
-            if minEval==evaluation:
-                best_move = move
-        return minEval, best_move
-
-def get_all_moves(board, color, game):
-    moves = []                              # Store the new board
-    # moves = [[new_board1, piece1], [new_board2, piece2]] => if we move the 'piece1' then the new board will be 'new_board1'....
-
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)          # get all the valid moves for that piece
-        for move, skip in valid_moves.items():
-            # Visulalize and Simulate the board to check the best possible move 
-            # draw_moves(game, board, piece)
-            # valid_moves.items() => dictionary => (row, col) : [pieces] => pieces that we skip to move to the position (row, col)
-
-            # Make copy every time => To determine what the new board will look like on moving to position
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
-            # if we move the 'piece' => new board will be 'new_board' => score that board and see which board is the best and return it
-
-    return moves
-
-# take the piece, take the move to make, take the temporary board and then make the move on it and return new board after that move
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
-
-# Visulalize and Simulate the board to check the best possible move
-def draw_moves(game, board, piece):
-    valid_moves = board.get_valid_moves(piece)
-    board.draw(game.win)
-    pygame.draw.circle(game.win, (0, 255, 0), (piece.x, piece.y), 50, 5)
-    game.draw_valid_moves(valid_moves.keys())
-    pygame.display.update()
+from checkers.constants import RED, WHITE
+
+# position => current position
+# pass the current board in the minimax algorithm => get the best board after those positions
+# depth => depth of the tree => how far extending the tree
+# max_player => boolean => whether minimizing the value or maximizing the value
+# game => game object
+def minimax(position, depth, max_player, game):
+    # Search on a copy => moves are played and taken back on it, the board shown by the game is never touched
+    evaluation, best_move = search(position.copy(), depth, max_player)
+    if best_move is None:               # depth = 0, game over or no move left => nothing to play
+        return evaluation, position
+    return evaluation, simulate_move(best_move, position.copy())
+
+# Minimax over a single board => every move is applied in place and undone after it has been scored
+# return the score and the best move (src, dst, captured) instead of a new board
+def search(board, depth, max_player):
+    if depth==0 or board.winner() != None:                  # depth = 0 => last node in the tree or game over => no need to continue
+        return board.evaluate(), None
+
+    # maximize the score
+    if max_player:
+        maxEval = float('-inf')
+        best_move = None                # store the best move we can make
+
+        # for every single move that we can potentially make => evaluate that move
+        for move in board.get_move_list(WHITE):
+            undo = board.apply_move(move)
+            evaluation = search(board, depth-1, False)[0]
+            board.undo_move(undo)                       # back to the position before the move
+            maxEval = max(maxEval, evaluation)          # is the move better than move that we already have
+            if maxEval==evaluation:
+                best_move = move
+        return maxEval, best_move
+
+    # minimize the score
+    else:
+        minEval = float('inf')
+        best_move = None                # store the best move we can make
+
+        # for every single move that we can potentially make => evaluate that move
+        for move in board.get_move_list(RED):
+            undo = board.apply_move(move)
+            evaluation = search(board, depth-1, True)[0]
+            board.undo_move(undo)
+            minEval = min(minEval, evaluation)          # is the move better than move that we already have
+            if minEval==evaluation:
+                best_move = move
+        return minEval, best_move
+
+def get_all_moves(board, color, game):
+    moves = []                              # Store the new board
+    # moves = [new_board1, new_board2, ...] => one new board for every move that 'color' can make
+    # The search itself does not use this => it plays the moves on one board with apply_move()/undo_move()
+
+    for move in board.get_move_list(color):
+        # Visulalize and Simulate the board to check the best possible move
+        # draw_moves(game, board, piece)
+        new_board = simulate_move(move, board.copy())
+        moves.append(new_board)
+
+    return moves
+
+# take the move to make and the temporary board, make the move on it and return new board after that move
+def simulate_move(move, board):
+    board.apply_move(move)
+    return board
+
+# Visulalize and Simulate the board to check the best possible move
+def draw_moves(game, board, piece):
+    # pygame is only needed here => imported when it is used so the search runs without it
+    import pygame
+    from checkers.render import BoardView
+
+    valid_moves = board.get_valid_moves(piece)
+    BoardView(game.win).draw(board, valid_moves)        # a new view draws the whole window
+    pygame.draw.circle(game.win, (0, 255, 0), (piece.x, piece.y), 50, 5)
+    pygame.display.update()
+
+    # The game's own view no longer knows what the window shows => it redraws all of it on the next frame
+    game.view.invalidate()
@@ -0,0 +1,462 @@
+# Alpha-beta search with principal variation search (PVS)
+# Gives the same score and the same move as minimax() for the same depth, but skips the parts of the tree
+# that cannot change the result
+#
+# alpha => score the side to move is already sure to get
+# beta => score the opponent is already sure to get => anything better than beta will never be allowed
+# negamax form => every score is seen from the side to move => best for one side = -(best for the other side)
+
+import time
+
+from checkers.bitboard import popcount
+from checkers.constants import RED, WHITE
+from checkers.zobrist import SIDE
+from .tablebase import TB_WIN
+from .transposition import EXACT, LOWER, UPPER
+
+# Board.evaluate() is from white's point of view => multiply by this to get it from the side to move
+SIGN = {WHITE: 1, RED: -1}
+
+# Zobrist key of the side to move => XOR with Board.hash to get the key of the position
+SIDE_KEY = {WHITE: SIDE, RED: 0}
+
+INF = float('inf')
+
+# Width of the null window => the scout search uses (alpha, alpha + NULL_WINDOW) instead of alpha == beta
+# with alpha == beta a fail-soft score of exactly alpha (stand pat, a stored bound) could be a bound in either direction
+# any width above 0 keeps the two apart => a score inside the window is simply exact
+NULL_WINDOW = 1e-6
+
+# Scores beyond this are tablebase wins and losses (TB_WIN - distance - ply) => see to_table()
+WIN_SCORES = TB_WIN // 2
+
+# Tablebase wins depend on the ply they were found at => the transposition table stores them counted from the position
+# itself, so a stored win means the same when the position comes up again at another ply
+def to_table(score, ply):
+    if score > WIN_SCORES:
+        return score + ply
+    if score < -WIN_SCORES:
+        return score - ply
+    return score
+
+def from_table(score, ply):
+    if score > WIN_SCORES:
+        return score - ply
+    if score < -WIN_SCORES:
+        return score + ply
+    return score
+
+# Deepest iteration iterative_deepening() will start
+MAX_DEPTH = 64
+
+# Killer moves are remembered for this many plies from the root
+MAX_PLY = 128
+
+# Depth 1 positions with at least this many moves get their leaves scored in one batch (see _batch_leaves())
+BATCH_MOVES = 8
+
+# Move ordering => the sooner the best move is searched, the more of the other moves get pruned
+# captures first (more pieces captured => earlier), then the hash move (best move from the transposition table or
+# the previous iteration), then the killer moves of this ply, then the other moves by their history score
+def order_moves(moves, hash_move=None, killers=(), history=None):
+    def priority(move):
+        if move[2]:
+            return 3000000 + 10 * popcount(move[2]) + (move == hash_move)
+        if move == hash_move:
+            return 2000000
+        if move in killers:
+            return 1000001 if move == killers[0] else 1000000
+        return history.get(move, 0) if history else 0
+
+    # sort() is stable => moves with the same priority stay in the order they came in
+    moves.sort(key=priority, reverse=True)
+
+# Raised inside the search when it runs out of time or stop() is called => unwinds straight back to the driver
+class SearchAborted(Exception):
+    pass
+
+class AlphaBeta:
+    # table => optional TranspositionTable shared between searches
+    # ordering => sort the moves with order_moves() (killer moves and history heuristic)
+    # quiescence => at depth 0 keep searching captures before evaluating (see _quiesce())
+    # without a table, ordering and quiescence the search gives exactly the same move as minimax(), with them positions
+    # searched deeper earlier can be reused and ties can be broken differently => stronger but no longer identical
+    # tablebase => optional Tablebase, positions with few pieces left get their exact win/loss/draw score from it
+    # evaluator => optional evaluation.Evaluator used instead of Board.evaluate()
+    # batch => score the leaves below depth 1 positions together in one NumPy batch (needs an evaluator)
+    #          a batch costs about as much as 7 single evaluations and a cutoff leaves most of it unused => only worth
+    #          it once the evaluation gets more expensive than the features in minimax.evaluation
+    def __init__(self, table=None, ordering=True, quiescence=True, tablebase=None, evaluator=None, batch=False):
+        self.table = table
+        self.ordering = ordering
+        self.quiescence = quiescence
+        self.tablebase = tablebase
+        self.evaluator = evaluator
+        self.batch = batch and evaluator is not None
+
+        # Board.hash => score from the last batch of leaves, taken out again when the leaf is reached
+        self.leaf_scores = {}
+
+        # Quiet moves that caused a beta cutoff => two per ply, tried early in sibling positions
+        self.killers = [[None, None] for ply in range(MAX_PLY)]
+
+        # Quiet move => how often (weighted by depth) it caused a beta cutoff anywhere in the tree
+        self.history = {}
+
+        # Number of positions visited by the last search => compare with minimax to see how much was pruned
+        self.nodes = 0
+
+        # Beta cutoffs in the last search
+        self.cutoffs = 0
+
+        # Optional stats.SearchStats => filled in by iterative_deepening(), None => nothing is recorded
+        self.stats = None
+
+        # Set by stop() or when the time runs out => the running search is abandoned
+        self.stopped = False
+        self.deadline = None            # time.time() at which a timed search has to give up
+
+    # Abort the running search => safe to call from another thread
+    def stop(self):
+        self.stopped = True
+
+    # Forget the killer moves and history of the previous search
+    def _new_search(self):
+        self.nodes = self.cutoffs = 0
+        self.stopped = False
+        self.killers = [[None, None] for ply in range(MAX_PLY)]
+        self.history = {}
+        if self.table is not None:
+            self.table.new_search()
+
+    # Same arguments as minimax() but returns the score and the best move (src, dst, captured) on 'board'
+    def search(self, board, depth, max_player):
+        self._new_search()
+        self.deadline = None
+        return self._root(board, depth, WHITE if max_player else RED)
+
+    # Search depth 1, 2, 3, .... until 'time_ms' milliseconds are used up or stop() is called
+    # return the score and best move of the last depth that finished, and that depth
+    # every depth starts with the best move of the one before it => usually the best move again, so the rest prune fast
+    def iterative_deepening(self, board, max_player, time_ms, max_depth=MAX_DEPTH):
+        start = time.time()
+        self._new_search()
+        self.deadline = start + time_ms / 1000.0
+
+        color = WHITE if max_player else RED
+        board = board.copy()            # an aborted search leaves its moves on the board => never use the caller's board
+        evaluation, best_move, reached = self._evaluate(board, WHITE), None, 0
+        stats = self.stats
+        if stats is not None:
+            stats.begin(self)
+
+        for depth in range(1, max_depth + 1):
+            iteration = time.time()
+            try:
+                evaluation, best_move = self._root(board, depth, color, best_move)
+            except SearchAborted:
+                break
+            reached = depth
+            if stats is not None:
+                stats.iteration(depth, self.nodes, evaluation, self.principal_variation(board, color, best_move, depth))
+
+            # Game over or a forced win/loss => searching deeper will not change anything
+            if best_move is None or abs(evaluation) == INF:
+                break
+
+            # The next depth takes several times longer than this one => it would not finish anyway
+            now = time.time()
+            if now + 2 * (now - iteration) > self.deadline:
+                break
+
+        # Not even depth 1 finished => play any legal move rather than none
+        if best_move is None and reached == 0:
+            moves = board.get_move_list(color)
+            if moves:
+                best_move = moves[0]
+        if stats is not None:
+            stats.finish(self, reached, evaluation, best_move)
+        return evaluation, best_move, reached
+
+    # Best line found => 'first_move', then the best moves stored in the transposition table, at most 'depth' moves
+    def principal_variation(self, board, color, first_move, depth):
+        pv = []
+        move = first_move
+        board = board.copy()
+        while move is not None and len(pv) < depth and move in board.get_move_list(color):
+            pv.append(move)
+            board.apply_move(move)
+            color = RED if color==WHITE else WHITE
+            entry = self.table.peek(board.hash ^ SIDE_KEY[color]) if self.table is not None else None
+            move = entry[4] if entry is not None else None
+        return pv
+
+    # Common engine call (see minimax.engine) => iterative deepening is how this engine thinks
+    think = iterative_deepening
+
+    # Search the moves of the root position => 'first_move' (best move of the previous iteration) is searched first
+    def _root(self, board, depth, color, first_move=None):
+        self.nodes += 1
+        if depth==0 or board.winner() != None:
+            return self._evaluate(board, WHITE), None
+
+        other = RED if color==WHITE else WHITE
+        best, best_move = -INF, None
+        alpha, beta = -INF, INF
+
+        # minimax() keeps the last move with the best score => go through the moves backwards and keep the first one
+        # that is strictly better => the same move is picked even though equal moves are only searched with a null window
+        moves = board.get_move_list(color)
+        moves.reverse()
+        hash_move = first_move
+        if self.table is not None:
+            key = board.hash ^ SIDE_KEY[color]
+            entry = self.table.probe(key)
+            if hash_move is None and entry is not None:
+                hash_move = entry[4]
+        self._order(moves, hash_move, 0)
+
+        for move in moves:
+            undo = board.apply_move(move)
+            score = self._pvs(board, depth-1, alpha, beta, other, best_move is None, 1)
+            board.undo_move(undo)
+
+            if score > best or best_move is None:
+                best, best_move = score, move
+                alpha = max(alpha, score)
+
+        if self.table is not None:
+            self.table.store(key, depth, EXACT, best, best_move)
+        return best * SIGN[color], best_move
+
+    # Score of one root 'move' for 'color' within the window (alpha, beta) => beta == alpha + NULL_WINDOW is a null
+    # window test, used by the parallel search to hand out root moves to worker processes
+    def score_move(self, board, move, depth, alpha, beta, color):
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = None
+
+        undo = board.apply_move(move)
+        score = -self._negamax(board, depth-1, -beta, -alpha, RED if color==WHITE else WHITE, 1)
+        board.undo_move(undo)
+        return score
+
+    # Put the moves in the order they should be searched in
+    # without ordering only the hash move (most likely to cause a cutoff) is moved to the front
+    def _order(self, moves, hash_move, ply):
+        if self.ordering:
+            order_moves(moves, hash_move, self.killers[ply] if ply < MAX_PLY else (), self.history)
+        elif hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+
+    # A quiet move caused a beta cutoff => remember it as a killer of this ply and raise its history score
+    def _cutoff(self, move, depth, ply):
+        self.cutoffs += 1
+        if move[2] or not self.ordering:
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    # Score a child => the first child gets the full window, every other child is first tested with a null window
+    # (can it beat alpha at all?) and only re-searched with the full window when the test says yes
+    def _pvs(self, board, depth, alpha, beta, color, first, ply):
+        if first:
+            return -self._negamax(board, depth, -beta, -alpha, color, ply)
+
+        score = -self._negamax(board, depth, -alpha - NULL_WINDOW, -alpha, color, ply)
+        if alpha < score < beta:
+            score = -self._negamax(board, depth, -beta, -alpha, color, ply)
+        return score
+
+    # Fail-soft negamax => the score returned can be outside (alpha, beta), then it is only a bound
+    # ply => distance from the root, used for the killer moves
+    def _negamax(self, board, depth, alpha, beta, color, ply):
+        self.nodes += 1
+
+        # Look at the clock every 256 positions => cheap enough, and still gives up within a few milliseconds
+        if self.nodes & 255 == 0 and self.deadline is not None and time.time() > self.deadline:
+            self.stopped = True
+        if self.stopped:
+            raise SearchAborted()
+
+        # Few pieces left => the tablebase knows the result, quicker wins (slower losses) score higher
+        tablebase = self.tablebase
+        if tablebase is not None and popcount(board.red | board.white) <= tablebase.max_pieces:
+            score = tablebase.score(board, color, ply)
+            if score is not None:
+                return score
+
+        if board.winner() != None:
+            return self._evaluate(board, color)
+        if depth==0:
+            if self.quiescence:
+                return self._quiesce(board, alpha, beta, color, ply)
+            return self._evaluate(board, color)
+
+        table = self.table
+        hash_move = None
+        if table is not None:
+            key = board.hash ^ SIDE_KEY[color]
+            entry = table.probe(key)
+
+            # Searched at least this deep before => the stored score or bound may already answer the question
+            if entry is not None and entry[1] >= depth:
+                bound, score = entry[2], from_table(entry[3], ply)
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score >= beta:
+                    return score
+                if bound == UPPER and score <= alpha:
+                    return score
+            if entry is not None:
+                hash_move = entry[4]
+            original_alpha = alpha
+
+        moves = board.get_move_list(color)
+        self._order(moves, hash_move, ply)
+        if depth==1 and self.batch and len(moves) >= BATCH_MOVES:
+            self._batch_leaves(board, moves)
+
+        other = RED if color==WHITE else WHITE
+        best = -INF                     # no move at all => lost, same as minimax
+        best_move = None
+
+        for move in moves:
+            undo = board.apply_move(move)
+            score = self._pvs(board, depth-1, alpha, beta, other, best == -INF, ply+1)
+            board.undo_move(undo)
+
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:           # opponent will never let us get here => prune the rest of the moves
+                        self._cutoff(move, depth, ply)
+                        break
+
+        if table is not None:
+            if best >= beta:
+                bound = LOWER
+            elif best <= original_alpha:
+                bound = UPPER
+            else:
+                bound = EXACT
+            table.store(key, depth, bound, to_table(best, ply), best_move)
+        return best
+
+    # Static score of 'board' from the side to move
+    def _evaluate(self, board, color):
+        evaluator = self.evaluator
+        if evaluator is None:
+            return board.evaluate() * SIGN[color]
+        score = self.leaf_scores.pop(board.hash, None)
+        if score is None:
+            score = evaluator.evaluate(board)
+        return score * SIGN[color]
+
+    # Every move of a depth 1 position leads to a leaf => score all of them in one batch before they are searched
+    def _batch_leaves(self, board, moves):
+        positions, hashes = [], []
+        for move in moves:
+            undo = board.apply_move(move)
+            positions.append((board.red, board.white, board.kings))
+            hashes.append(board.hash)
+            board.undo_move(undo)
+        scores = self.evaluator.evaluate_batch(positions)
+        self.leaf_scores = dict(zip(hashes, scores.tolist()))
+
+    # Quiescence search => evaluating a position where a capture is pending gives a score that is about to change
+    # so only captures are searched further until the position is quiet
+    # captures are optional in this game => the side to move can always "stand pat" and keep the static evaluation
+    # the position itself was already counted by _negamax() => only the captures searched here add nodes
+    def _quiesce(self, board, alpha, beta, color, ply):
+        if self.nodes & 255 == 0 and self.deadline is not None and time.time() > self.deadline:
+            self.stopped = True
+        if self.stopped:
+            raise SearchAborted()
+
+        best = self._evaluate(board, color)
+        if best >= beta or board.winner() != None:
+            return best
+        if best > alpha:
+            alpha = best
+
+        moves = board.get_capture_list(color)
+        if len(moves) > 1:
+            order_moves(moves)
+
+        other = RED if color==WHITE else WHITE
+        for move in moves:
+            undo = board.apply_move(move)
+            self.nodes += 1
+            score = -self._quiesce(board, -beta, -alpha, other, ply+1)
+            board.undo_move(undo)
+
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+# Drop-in replacement for minimax() => returns the score and the new board after the best move
+# pass the same 'table' on every turn to reuse what earlier searches found
+def alphabeta(position, depth, max_player, game, table=None):
+    evaluation, best_move = AlphaBeta(table).search(position.copy(), depth, max_player)
+    if best_move is None:
+        return evaluation, position
+
+    new_board = position.copy()
+    new_board.apply_move(best_move)
+    return evaluation, new_board
+
+# Same as alphabeta() but searches as deep as it can in 'time_ms' milliseconds instead of a fixed depth
+def alphabeta_timed(position, time_ms, max_player, game, table=None):
+    evaluation, best_move, depth = AlphaBeta(table).iterative_deepening(position, max_player, time_ms)
+    if best_move is None:
+        return evaluation, position
+
+    new_board = position.copy()
+    new_board.apply_move(best_move)
+    return evaluation, new_board
+
+# Number of positions plain minimax visits => every position of the full tree down to 'depth'
+def minimax_nodes(board, depth, color):
+    if depth==0 or board.winner() != None:
+        return 1
+
+    nodes = 1
+    other = RED if color==WHITE else WHITE
+    for move in board.get_move_list(color):
+        undo = board.apply_move(move)
+        nodes += minimax_nodes(board, depth-1, other)
+        board.undo_move(undo)
+    return nodes
+
+# Compare node counts with minimax from the starting position => python -m minimax.alphabeta [max depth]
+# minimax has no quiescence search => it is off here as well, otherwise the captures searched past the leaves would
+# be counted against a tree that does not have them
+if __name__ == "__main__":
+    import sys
+    from checkers.board import Board
+    from .transposition import TranspositionTable
+
+    for depth in range(1, int(sys.argv[1]) + 1 if len(sys.argv) > 1 else 7):
+        full = minimax_nodes(Board(), depth, WHITE)
+        print("depth %d: minimax %d nodes" % (depth, full))
+
+        for name, table, ordering in (("alpha-beta", None, False),
+                                      ("+ transposition table", TranspositionTable(), False),
+                                      ("+ move ordering", TranspositionTable(), True)):
+            engine = AlphaBeta(table, ordering, quiescence=False)
+            start = time.time()
+            engine.search(Board(), depth, True)
+            elapsed = time.time() - start
+            hits = ", hit rate %.1f%%" % (100.0 * table.hit_rate) if table is not None else ""
+            print("    %-22s %9d nodes (%5.1f%%)%s, %.2fs" % (name, engine.nodes, 100.0 * engine.nodes / full, hits, elapsed))
@@ -0,0 +1,114 @@
+# Batch analysis of PDN games => search every position of every game to a fixed depth and write the games back
+# with the score and best move of each position as comments
+#     python -m minimax.analysis games.pdn --depth 8 --output annotated.pdn --json analysis.jsonl
+#
+# The input is read one game at a time (checkers.pdn.read_games()) and at most a few games per worker are waiting
+# at any time => a file of any size is analyzed in constant memory
+# Results are written in the order of the input as soon as they are ready => an interrupted run keeps what it wrote
+#
+# A move that is not legal on the board ends the replay => the game is written up to it with the result "*" and a
+# Termination header naming the move, and main() warns about it => the rest of the game is never dropped silently
+#
+# Comment of a move => "score best loss" => score of the position before the move (white's point of view), the move
+# the engine prefers, and how much the move played lost for its side against that score (only when it lost something)
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from checkers.constants import WHITE
+from checkers.pdn import move_text, read_games, replay, start_position, write_game
+
+from .engine import make_engine
+from .stats import finite, score_text
+from .tablebase import Tablebase
+
+# Engine of a worker process => created once by _init_worker(), its transposition table lasts for all its games
+_engine = None
+
+def _init_worker(size_mb, tablebase=None, weights=None):
+    global _engine
+    _engine = make_engine("alphabeta", size_mb, tablebase=Tablebase(tablebase) if tablebase else None, weights=weights)
+
+# Runs in a worker process => one record per move of the game
+# record => {"ply", "move", "score", "best", "loss"} => loss is None for the last move (no position after it)
+def analyze_game(game, depth):
+    headers, moves, result = game
+    plies, colors = [], []
+    for board, color, move in replay(moves, *start_position(headers)):
+        score, best, reached = _engine.think(board, color==WHITE, float('inf'), depth)
+        plies.append({"ply": len(plies), "move": move_text(move), "score": finite(score),
+                      "best": move_text(best) if best is not None else None, "loss": None})
+        colors.append(color)
+
+    # Score after a move => score of the next position => what the mover gave away against the best move
+    for record, color, after in zip(plies, colors, plies[1:]):
+        change = after["score"] - record["score"]
+        record["loss"] = round(max(0.0, -change if color==WHITE else change), 2)
+
+    # Stopped before the end => the result belongs to moves that are not in the output any more
+    if len(plies) < len(moves):
+        headers = dict(headers, Termination="illegal move %s at ply %d" % (moves[len(plies)], len(plies) + 1))
+        result = "*"
+    return headers, moves[:len(plies)], result, plies
+
+def comment(record):
+    text = "%s %s" % (score_text(record["score"]), record["best"] or "-")
+    if record["loss"] and record["loss"] >= 1e8:
+        text += " blunder"              # the move threw away a won game or walked into a lost one
+    elif record["loss"]:
+        text += " %.2f" % record["loss"]
+    return text
+
+# Analyze every game of 'path' => yields (headers, moves, result, records) in the order of the file
+# window => games handed to the pool ahead of the one being written
+def analyze_file(path, depth, workers=None, size_mb=16, tablebase=None, weights=None, window=4):
+    workers = workers or os.cpu_count()
+    with open(path) as f, ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                              initargs=(size_mb, tablebase, weights)) as executor:
+        pending = deque()
+        for game in read_games(f):
+            pending.append(executor.submit(analyze_game, game, depth))
+            if len(pending) >= window * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze every position of the games in a PDN file")
+    parser.add_argument("pdn", help="PDN file to read the games from")
+    parser.add_argument("--depth", type=int, default=6, help="search depth of every position")
+    parser.add_argument("--output", default="annotated.pdn", help="PDN file the annotated games are written to")
+    parser.add_argument("--json", help="also write one JSON line per game with the score of every move")
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 => one per CPU core)")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size of each worker in MB")
+    parser.add_argument("--weights", help="evaluation weights file (see minimax.tuner)")
+    parser.add_argument("--tablebase", help="directory of endgame tablebases (see minimax.tablebase)")
+    args = parser.parse_args()
+
+    games = 0
+    json_file = open(args.json, "w") if args.json else None
+    try:
+        with open(args.output, "w") as f:
+            for headers, moves, result, plies in analyze_file(args.pdn, args.depth, args.workers or None, args.hash,
+                                                                args.tablebase, args.weights):
+                if "Termination" in headers and headers["Termination"].startswith("illegal move"):
+                    print("warning: game %d stops at an %s => analyzed up to it, result set to *"
+                          % (games + 1, headers["Termination"]), file=sys.stderr)
+                headers = dict(headers, Annotator="minimax.analysis depth %d" % args.depth)
+                write_game(f, headers, moves, result, [comment(record) for record in plies], start_position(headers)[1])
+                f.flush()
+                if json_file:
+                    json_file.write(json.dumps({"headers": headers, "result": result, "moves": plies}) + "\n")
+                    json_file.flush()
+                games += 1
+    finally:
+        if json_file:
+            json_file.close()
+    print("%d games analyzed to depth %d, written to %s" % (games, args.depth, args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Benchmark suite of the engine package => both games (Checkers and Checkers AI) run on the same checkers package,
+# so this guards the rules and the speed of both
+#     python -m minimax.benchmark                          => run everything and print the results
+#     python -m minimax.benchmark --save benchmark.json    => also keep the results as the baseline
+#     python -m minimax.benchmark --check benchmark.json   => fail if the rules changed or anything got slower
+#
+# Rules => perft counts from the starting position, with forced captures (published numbers) and with the optional
+#          captures and short multi-jumps the game itself plays => any difference fails, with or without a baseline
+# Speed => operations per second of the move generator, make/unmake, copy, evaluation and search => fails when one is
+#          more than --tolerance slower than the baseline (speeds depend on the machine => keep one baseline per machine)
+#
+# The exit status is 1 when a check failed => usable as a CI step
+
+import argparse
+import json
+import sys
+import time
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from checkers.perft import PUBLISHED, perft
+
+from .alphabeta import AlphaBeta
+from .transposition import TranspositionTable
+
+# Perft counts of the rules of the game (captures may be skipped, multi-jumps may stop early)
+OPTIONAL_CAPTURES = {
+    1: 7,
+    2: 49,
+    3: 379,
+    4: 2872,
+    5: 23582,
+    6: 190647,
+    7: 1607272,
+}
+
+# Positions the speed benchmarks play on => the start, and the positions after a few moves of a fixed game
+def positions(plies=24):
+    board, color = Board(), RED
+    result = [(board.copy(), color)]
+    for ply in range(plies):
+        moves = board.get_move_list(color)
+        if not moves or board.winner() != None:
+            break
+        board.apply_move(moves[ply * 7 % len(moves)])
+        color = WHITE if color==RED else RED
+        result.append((board.copy(), color))
+    return result
+
+# Best time of 'repeat' runs of 'function' => operations per second, 'count' => operations in one run
+def rate(function, count, repeat):
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+def check_rules(depth):
+    failures = []
+    for forced, expected in ((True, PUBLISHED), (False, OPTIONAL_CAPTURES)):
+        for d in range(1, min(depth, max(expected)) + 1):
+            nodes = perft(Board(), d, RED, forced)
+            if nodes != expected[d]:
+                failures.append("perft %d (%s captures) = %d, expected %d"
+                                % (d, "forced" if forced else "optional", nodes, expected[d]))
+    return failures
+
+def run_speed(repeat, search_depth):
+    results = {}
+    boards = positions()
+
+    results["perft_moves_per_sec"] = rate(lambda: perft(Board(), 5, RED, False), OPTIONAL_CAPTURES[5], repeat)
+
+    def make_unmake():
+        for board, color in boards:
+            for move in board.get_move_list(color):
+                board.undo_move(board.apply_move(move))
+    count = sum(len(board.get_move_list(color)) for board, color in boards)
+    results["make_unmake_per_sec"] = rate(lambda: [make_unmake() for i in range(100)], 100 * count, repeat)
+
+    results["copy_per_sec"] = rate(lambda: [board.copy() for i in range(1000) for board, color in boards],
+                                   1000 * len(boards), repeat)
+    results["evaluate_per_sec"] = rate(lambda: [board.evaluate() for i in range(10000) for board, color in boards],
+                                       10000 * len(boards), repeat)
+
+    # Feature evaluation needs NumPy => skipped where it is not installed
+    try:
+        from .evaluation import Evaluator
+    except ImportError:
+        pass
+    else:
+        evaluator = Evaluator([1.0, 1.5, 0.05, 0.1, 0.02])
+        results["features_per_sec"] = rate(lambda: [evaluator.evaluate(board) for i in range(200) for board, color in boards],
+                                           200 * len(boards), repeat)
+
+    # Fixed depth search from the same positions => same nodes every run, only the time changes
+    def search():
+        nodes = 0
+        for board, color in boards[::6]:
+            engine = AlphaBeta(TranspositionTable(16))
+            engine.search(board, search_depth, color==WHITE)
+            nodes += engine.nodes
+        return nodes
+    nodes = search()
+    results["search_nodes"] = nodes
+    results["search_nodes_per_sec"] = rate(search, nodes, repeat)
+    return results
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for name, value in baseline.items():
+        if name.endswith("_per_sec") and name in results and results[name] < value * (1 - tolerance):
+            failures.append("%s %.0f is %.0f%% slower than the baseline %.0f"
+                            % (name, results[name], 100 * (1 - results[name] / value), value))
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the rules and measure the speed of the checkers engine")
+    parser.add_argument("--perft", type=int, default=6, help="check the perft counts up to this depth")
+    parser.add_argument("--depth", type=int, default=6, help="depth of the search benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of every speed benchmark => the best one counts")
+    parser.add_argument("--save", help="write the results to this file as the new baseline")
+    parser.add_argument("--check", help="baseline file to compare the speeds with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline (0.25 => 25%%)")
+    args = parser.parse_args()
+
+    # Measure the move generator itself => with the move cache the repeated runs would only be lookups
+    Board.move_cache = None
+
+    failures = check_rules(args.perft)
+    print("rules: perft 1..%d %s" % (args.perft, "ok" if not failures else "FAILED"))
+
+    results = run_speed(args.repeat, args.depth)
+    for name, value in results.items():
+        print("  %-24s %14.0f" % (name, value))
+
+    if args.check:
+        with open(args.check) as f:
+            failures += compare(results, json.load(f), args.tolerance)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    for failure in failures:
+        print("FAILED: " + failure)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# Opening book => moves for the first positions of a game, looked up instead of searched
+#
+# File format (little endian)
+#   header  => b"CKBOOK1\0", number of entries (uint32), 4 bytes padding          => 16 bytes
+#   entries => position key (uint64), from square (uint8), to square (uint8),
+#              captured squares (uint32 mask), weight (uint16)                   => 16 bytes each
+# Entries are sorted by key => a lookup is a binary search straight on the memory-mapped file, nothing is loaded
+# key => Board.hash ^ zobrist.SIDE when white is to move (same key as the transposition table)
+#
+# Build a book:
+#   python -m minimax.book --games 200 --depth 6 --plies 12 --output book.bin
+#   python -m minimax.book --pdn games.pdn --plies 16 --output book.bin
+
+import mmap
+import os
+import random
+import struct
+
+from checkers.constants import RED, WHITE
+from checkers.zobrist import SIDE
+
+MAGIC = b"CKBOOK1\0"
+HEADER = struct.Struct("<8sI4x")
+ENTRY = struct.Struct("<QBBIH")
+KEY = struct.Struct("<Q")
+
+# Key of the position with 'color' to move
+def book_key(board, color):
+    return board.hash ^ (SIDE if color==WHITE else 0)
+
+class OpeningBook:
+    # Memory-map the book file => opening it costs nothing more than the mmap
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not an opening book" % path)
+
+    def __len__(self):
+        return self.count
+
+    def _key(self, index):
+        return KEY.unpack_from(self.data, HEADER.size + index * ENTRY.size)[0]
+
+    # All book moves for the position => [(move, weight), ...], empty if the position is not in the book
+    def probe(self, board, color):
+        key = book_key(board, color)
+
+        # Binary search for the first entry with this key
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        moves = []
+        index = low
+        while index < self.count:
+            entry_key, src, dst, captured, weight = ENTRY.unpack_from(self.data, HEADER.size + index * ENTRY.size)
+            if entry_key != key:
+                break
+            moves.append(((1 << src, 1 << dst, captured), weight))
+            index += 1
+
+        # Only keep moves that are legal here => a hash collision can never make the AI play nonsense
+        legal = board.get_move_list(color)
+        return [(move, weight) for move, weight in moves if move in legal]
+
+    # Pick a book move => weighted at random when 'rng' is given, otherwise the one played most often
+    # return None if the position is not in the book
+    def choose(self, board, color, rng=None):
+        moves = self.probe(board, color)
+        if not moves:
+            return None
+        if rng is None:
+            return max(moves, key=lambda item: item[1])[0]
+        return rng.choices([move for move, weight in moves], [weight for move, weight in moves])[0]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+# Write a book from {(key, move): weight}
+def write_book(path, counts):
+    entries = sorted((key, move, weight) for (key, move), weight in counts.items())
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        for key, (src, dst, captured), weight in entries:
+            f.write(ENTRY.pack(key, src.bit_length() - 1, dst.bit_length() - 1, captured, min(weight, 0xFFFF)))
+    return len(entries)
+
+# One self-play game => return the (key, move) pairs of the first 'plies' positions for a side that did not lose
+# the first 'random_plies' moves played are random so that the games do not all follow the same line, but only moves
+# picked by the search go in the book => in those positions the search's move is stored, not the random one
+def self_play_game(seed, depth, plies, random_plies):
+    from checkers.board import Board
+    from .alphabeta import AlphaBeta
+    from .transposition import TranspositionTable
+
+    rng = random.Random(seed)
+    engine = AlphaBeta(TranspositionTable(8))
+    board, color = Board(), RED
+    played = []
+    winner = None
+    for ply in range(200):
+        if board.winner() != None:
+            winner = board.winner()
+            break
+        moves = board.get_move_list(color)
+        if not moves:
+            winner = WHITE if color==RED else RED
+            break
+
+        if ply < plies or ply >= random_plies:
+            evaluation, move = engine.search(board, depth, color==WHITE)
+        if ply < plies:
+            played.append((book_key(board, color), move, color))
+        if ply < random_plies:
+            move = rng.choice(moves)
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+
+    return [(key, move) for key, move, side in played if winner is None or side == winner]
+
+# (key, move) pairs of the first 'plies' moves of every game in a PDN file, for the sides that did not lose
+def pdn_moves(path, plies):
+    from checkers.pdn import read_games, replay
+
+    losers = {"1-0": WHITE, "0-1": RED}
+    with open(path) as f:
+        for headers, moves, result in read_games(f):
+            if "FEN" in headers:
+                continue                # set up from a position => not an opening
+            for ply, (board, color, move) in enumerate(replay(moves[:plies])):
+                if losers.get(result) != color:
+                    yield book_key(board, color), move
+
+def main():
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Build an opening book from self-play games and/or PDN files")
+    parser.add_argument("--output", default="book.bin")
+    parser.add_argument("--games", type=int, default=0, help="self-play games to play")
+    parser.add_argument("--depth", type=int, default=6, help="search depth of the self-play engine")
+    parser.add_argument("--plies", type=int, default=12, help="moves from the start of every game that go in the book")
+    parser.add_argument("--random-plies", type=int, default=2, help="random moves at the start of every self-play game")
+    parser.add_argument("--pdn", nargs="*", default=[], help="PDN files to read games from")
+    parser.add_argument("--workers", type=int, default=0, help="processes for self-play (0 => one per CPU core)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = {}
+    def add(pairs):
+        for pair in pairs:
+            counts[pair] = counts.get(pair, 0) + 1
+
+    for path in args.pdn:
+        add(pdn_moves(path, args.plies))
+
+    if args.games:
+        with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as executor:
+            seeds = range(args.seed, args.seed + args.games)
+            n = args.games
+            for pairs in executor.map(self_play_game, seeds, [args.depth] * n, [args.plies] * n, [args.random_plies] * n):
+                add(pairs)
+
+    print("%d positions, %d entries written to %s" % (len({key for key, move in counts}), write_book(args.output, counts), args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# Common engine interface => AIPlayer and the tournament only use these, so any engine can be plugged in
+#
+#   think(board, max_player, time_ms, max_depth) => (score from white's point of view, best move or None, depth)
+#   stop()                                       => abort a running think() from another thread
+#   nodes                                        => work done by the last think() (positions or playouts)
+#
+# AlphaBeta => iterative deepening alpha-beta, score in pieces (Board.evaluate())
+# MCTS      => Monte Carlo tree search, score is the expected result (-1..1), max_depth is ignored
+
+from .alphabeta import AlphaBeta
+from .mcts import MCTS
+from .transposition import TranspositionTable
+
+ENGINES = ("alphabeta", "mcts")
+
+# Build an engine by name => options that do not apply to it are ignored
+# size_mb, quiescence, tablebase, evaluator => AlphaBeta, rollouts, workers => MCTS
+# weights => path of a weights file written by minimax.tuner => AlphaBeta evaluates with those weights
+def make_engine(name="alphabeta", size_mb=16, quiescence=True, tablebase=None, rollouts=None, workers=1, evaluator=None,
+                weights=None):
+    if weights:
+        from .evaluation import load_weights        # NumPy is only needed when there is a weights file
+        evaluator = load_weights(weights)
+    if name == "alphabeta":
+        return AlphaBeta(TranspositionTable(size_mb), quiescence=quiescence, tablebase=tablebase, evaluator=evaluator)
+    if name == "mcts":
+        return MCTS(rollouts, workers=workers)
+    raise ValueError("unknown engine %r, expected one of %s" % (name, ", ".join(ENGINES)))
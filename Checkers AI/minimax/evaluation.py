@@ -0,0 +1,146 @@
+# Feature evaluation => a weighted sum of features instead of material only
+# Many positions at a time => NumPy (evaluate_batch()), one position at a time => lookup tables (Evaluator.evaluate())
+# AlphaBeta(evaluator=..., batch=True) hands all the leaves below a depth 1 position over at once
+#
+# Every feature is white minus red => the score is from white's point of view, like Board.evaluate()
+#   men          => men on the board
+#   kings        => kings on the board
+#   advancement  => rows the men have moved forward
+#   back_rank    => men still on their own back row (they stop the other side from crowning)
+#   mobility     => squares the pieces can slide to
+#
+# Positions are arrays of shape (n, 3) => one row (red, white, kings) of 32-bit bitboards per position
+
+import json
+
+import numpy as np
+
+from checkers.bitboard import (FULL, EVEN_ROWS, ODD_ROWS, LEFT_EDGE, RIGHT_EDGE, RED_CROWN, WHITE_CROWN,
+                               UP, DOWN, ALL_DIRECTIONS, popcount, step)
+
+FEATURES = ("men", "kings", "advancement", "back_rank", "mobility")
+
+# Weights that give exactly Board.evaluate() => men 1, kings 1.5 (a man plus the 0.5 bonus of a king)
+MATERIAL = np.array([1.0, 1.5, 0.0, 0.0, 0.0])
+
+# ROWS_FROM[k] => rows k..7 => a man on row r is counted once for every k <= r, so summing the counts gives its row
+ROWS_FROM = [(FULL << 4*k) & FULL for k in range(1, 8)]
+ROWS_UP_TO = [FULL >> 4*(8 - k) for k in range(1, 8)]          # rows 0..k-1 => same for red, which moves up
+
+# The batch path works on single squares => every bitboard is unpacked to 32 zeros and ones
+# occupancy => [red men, red kings, white men, white kings] side by side => 128 columns
+# men, kings, advancement and back rank add up a number per occupied square => one matrix product gives all four
+def _square_weights():
+    weights = np.zeros((128, 4))
+    for square in range(32):
+        row = square // 4
+        weights[square] = (-1, 0, -(7 - row), -(row == 7))          # red man
+        weights[32 + square] = (0, -1, 0, 0)                        # red king
+        weights[64 + square] = (1, 0, row, row == 0)                # white man
+        weights[96 + square] = (0, 1, 0, 0)                         # white king
+    return weights
+
+SQUARE_WEIGHTS = _square_weights()
+
+# (from square, to square) of every one-square slide down the board and up the board => mobility
+def _slides(directions):
+    pairs = [(square, step(1 << square, direction).bit_length() - 1)
+             for direction in directions for square in range(32) if step(1 << square, direction)]
+    return np.array([src for src, dst in pairs]), np.array([dst for src, dst in pairs])
+
+DOWN_FROM, DOWN_TO = _slides(DOWN)
+UP_FROM, UP_TO = _slides(UP)
+
+# Array of positions from a list of (red, white, kings) tuples or boards
+def encode(positions):
+    rows = [(p.red, p.white, p.kings) if hasattr(p, "red") else p for p in positions]
+    return np.array(rows, dtype=np.uint32).reshape(-1, 3)
+
+# Feature matrix of shape (n, len(FEATURES))
+def features_batch(positions):
+    squares = np.unpackbits(np.ascontiguousarray(positions, dtype="<u4").view(np.uint8), axis=1, bitorder="little")
+    squares = squares.astype(np.int8)
+    red, white, kings = squares[:, :32], squares[:, 32:64], squares[:, 64:]
+    red_kings, white_kings = red & kings, white & kings
+    occupancy = np.concatenate([red - red_kings, red_kings, white - white_kings, white_kings], axis=1)
+    empty = 1 - red - white
+
+    # Slides down are made by white pieces and red kings, slides up by red pieces and white kings
+    mobility = (((white - red_kings)[:, DOWN_FROM] * empty[:, DOWN_TO]).sum(axis=1)
+                + ((white_kings - red)[:, UP_FROM] * empty[:, UP_TO]).sum(axis=1))
+
+    return np.column_stack([occupancy @ SQUARE_WEIGHTS, mobility])
+
+# Scores of a batch of positions => one number per position, from white's point of view
+def evaluate_batch(positions, weights=MATERIAL):
+    return features_batch(positions) @ weights
+
+# Features of a single position in plain python => same numbers as one row of features_batch()
+def features(red, white, kings):
+    red_men, white_men = red & ~kings, white & ~kings
+    empty = ~(red | white) & FULL
+
+    advancement = sum(popcount(white_men & rows) for rows in ROWS_FROM) - sum(popcount(red_men & rows) for rows in ROWS_UP_TO)
+    mobility = 0
+    for direction in ALL_DIRECTIONS:
+        white_movers = white if direction in DOWN else white & kings
+        red_movers = red if direction in UP else red & kings
+        mobility += popcount(step(white_movers, direction) & empty) - popcount(step(red_movers, direction) & empty)
+
+    return (popcount(white_men) - popcount(red_men), popcount(white & kings) - popcount(red & kings), advancement,
+            popcount(white_men & RED_CROWN) - popcount(red_men & WHITE_CROWN), mobility)
+
+# Number of slides into 'empty' for pieces that may move down ('down') and up ('up') => bitboard.step() written out
+def _slide_count(down, up, empty):
+    count = 0
+    if down:
+        count += popcount((((down & EVEN_ROWS) << 4) | ((down & ODD_ROWS & ~LEFT_EDGE) << 3)) & empty)
+        count += popcount((((down & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((down & ODD_ROWS) << 4)) & empty)
+    if up:
+        count += popcount((((up & EVEN_ROWS) >> 4) | ((up & ODD_ROWS & ~LEFT_EDGE) >> 5)) & empty)
+        count += popcount((((up & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((up & ODD_ROWS) >> 4)) & empty)
+    return count
+
+class Evaluator:
+    # weights => one weight per feature (see FEATURES), MATERIAL scores like Board.evaluate()
+    def __init__(self, weights=MATERIAL):
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+        # Single position path => men, kings, advancement and back rank are a sum over the occupied squares, so the
+        # weighted sum of every byte of every bitboard is looked up => 16 lookups instead of counting features
+        # tables[group][byte number][byte value], group => red men, red kings, white men, white kings
+        square_scores = SQUARE_WEIGHTS @ self.weights[:4]
+        self.tables = [[[sum(float(square_scores[32*group + 8*part + i]) for i in range(8) if value >> i & 1)
+                         for value in range(256)] for part in range(4)] for group in range(4)]
+        self.mobility = float(self.weights[4])
+
+    # Score of one board => used where a single position is evaluated (quiescence search, small batches)
+    def evaluate(self, board):
+        red, white, kings = board.red, board.white, board.kings
+        score = 0.0
+        for mask, table in zip((red & ~kings, red & kings, white & ~kings, white & kings), self.tables):
+            score += table[0][mask & 0xFF] + table[1][mask >> 8 & 0xFF] + table[2][mask >> 16 & 0xFF] + table[3][mask >> 24]
+
+        if self.mobility:
+            empty = ~(red | white) & FULL
+            score += self.mobility * (_slide_count(white, white & kings, empty) - _slide_count(red & kings, red, empty))
+        return score
+
+    # Scores of an (n, 3) array of positions, or of a list that encode() turns into one
+    def evaluate_batch(self, positions):
+        if not isinstance(positions, np.ndarray):
+            positions = encode(positions)
+        return evaluate_batch(positions, self.weights)
+
+# Weights file => JSON {"features": [...], "weights": [...], ...} written by minimax.tuner
+def save_weights(path, weights, **info):
+    with open(path, "w") as f:
+        json.dump(dict(info, features=list(FEATURES), weights=[float(weight) for weight in weights]), f, indent=2)
+        f.write("\n")
+
+# Evaluator with the weights of a weights file => features missing from the file get weight 0
+def load_weights(path):
+    with open(path) as f:
+        data = json.load(f)
+    weights = dict(zip(data["features"], data["weights"]))
+    return Evaluator([weights.get(feature, 0.0) for feature in FEATURES])
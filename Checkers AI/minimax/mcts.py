@@ -0,0 +1,267 @@
+# Monte Carlo Tree Search (UCT) => instead of scoring positions with evaluate(), play random games from them and
+# keep the moves that win most often
+#
+# Every iteration:
+# 1. selection  => walk down the tree, always taking the child with the best UCT value (see uct())
+# 2. expansion  => add one untried move of the position we ended in as a new node
+# 3. playouts   => play 'batch' random games from the new node => one walk down the tree pays for several games
+# 4. backup     => add the results to every node on the way back to the root
+# The move played is the root move that was visited most
+#
+# Same interface as AlphaBeta (see minimax.engine) => think(), stop(), nodes
+
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from checkers.constants import RED, WHITE
+from checkers.zobrist import SIDE
+
+from .alphabeta import SIGN
+
+# Exploration constant of UCT => higher tries more moves, lower looks deeper at the best ones
+EXPLORATION = 1.4
+
+# A random game is stopped after this many plies => the side ahead in material is counted as the winner
+PLAYOUT_PLIES = 100
+
+# Playouts per think() when it has neither a time budget nor a rollout count
+DEFAULT_ROLLOUTS = 2000
+
+class Node:
+    __slots__ = ("move", "parent", "children", "untried", "color", "key", "visits", "score")
+
+    # move => move that led here, color => side to move in this position, key => Zobrist key of this position
+    # score => sum of the results of all playouts through this node for the side that played 'move'
+    def __init__(self, move, parent, color, key, moves):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = moves
+        self.color = color
+        self.key = key
+        self.visits = 0
+        self.score = 0.0
+
+    # UCT => average result + exploration bonus that grows for children that have been visited little
+    def uct(self, log_visits):
+        return self.score / self.visits + EXPLORATION * math.sqrt(log_visits / self.visits)
+
+def _key(board, color):
+    return board.hash ^ SIDE if color==WHITE else board.hash
+
+# Play random moves until the game is over => result from white's point of view (1 win, 0 draw, -1 loss)
+# the playout does not go through the move cache => random positions would only push useful ones out of it
+def playout(board, color, rng):
+    for ply in range(PLAYOUT_PLIES):
+        winner = board.winner()
+        if winner != None:
+            return SIGN[winner]
+        moves = board.get_move_list(color, cache=False)
+        if not moves:
+            return -SIGN[color]                 # no move => lost
+        board.apply_move(rng.choice(moves))
+        color = WHITE if color==RED else RED
+
+    material = board.evaluate()
+    return (material > 0) - (material < 0)
+
+class MCTS:
+    # rollouts => playouts per think(), None => only the time budget counts (DEFAULT_ROLLOUTS without one)
+    # math.inf => no limit at all => without a time budget think() runs until stop()
+    # batch => playouts per expanded node
+    # workers => > 1 => root parallelism, every process grows its own tree and the root visits are added up
+    # reuse => keep the part of the tree below the moves actually played for the next think()
+    def __init__(self, rollouts=None, batch=4, workers=1, reuse=True, seed=None):
+        self.rollouts = rollouts
+        self.batch = batch
+        self.workers = workers
+        self.reuse = reuse
+        self.rng = random.Random(seed)
+        self.root = None
+        self.executor = None
+
+        # Stop signal shared with the worker processes of root parallelism => created with the pool
+        self.stop_event = None
+
+        # Playouts of the last think() => counts as its "nodes", depth => deepest node it reached
+        self.nodes = self.depth = 0
+        self.stopped = False
+
+        # Optional stats.SearchStats => filled in by think(), None => nothing is recorded
+        self.stats = None
+
+    # Abort the running think() => safe to call from another thread, also reaches the worker processes
+    def stop(self):
+        self.stopped = True
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    # Same call as AlphaBeta.think() => max_depth is ignored, the tree grows where the playouts lead it
+    # return the expected result from white's point of view (-1..1), the best move and the deepest node reached
+    def think(self, board, max_player, time_ms=float('inf'), max_depth=None):
+        color = WHITE if max_player else RED
+        rollouts = self.rollouts
+        if rollouts is None and time_ms == float('inf'):
+            rollouts = DEFAULT_ROLLOUTS
+        stats = self.stats
+        if stats is not None:
+            stats.begin(self)
+
+        if self.workers > 1:
+            score, move, depth = self._think_parallel(board, color, time_ms, rollouts)
+            pv = [move] if move is not None else []
+        else:
+            root = self._grow(board.copy(), color, time_ms, rollouts)
+            if root.children:
+                best = max(root.children, key=lambda child: child.visits)
+                score, move, depth = SIGN[color] * best.score / best.visits, best.move, self.depth
+            else:
+                moves = board.get_move_list(color)
+                score, move, depth = board.evaluate(), (moves[0] if moves else None), 0
+            pv = self.principal_variation(root)
+
+        if stats is not None:
+            stats.iteration(depth, self.nodes, score, pv)
+            stats.finish(self, depth, score, move)
+        return score, move, depth
+
+    # Most visited line below 'root'
+    def principal_variation(self, root):
+        pv = []
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            pv.append(node.move)
+        return pv
+
+    # Run playouts from 'board' until the time or the rollouts are used up => return the root node
+    def _grow(self, board, color, time_ms, rollouts):
+        deadline = time.time() + time_ms / 1000.0
+        self.stopped = False
+        self.nodes = 0
+        self.depth = 0
+
+        root = self._find_root(board, color)
+        rng = self.rng
+        stop_event = self.stop_event
+        while not self.stopped and not (stop_event is not None and stop_event.is_set()) and (rollouts is None or self.nodes < rollouts) and time.time() < deadline:
+            node, position, depth = root, board.copy(), 0
+
+            # 1. selection
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                node = max(node.children, key=lambda child: child.uct(log_visits))
+                position.apply_move(node.move)
+                depth += 1
+
+            # 2. expansion
+            if node.untried:
+                move = node.untried.pop(rng.randrange(len(node.untried)))
+                position.apply_move(move)
+                other = WHITE if node.color==RED else RED
+                moves = position.get_move_list(other) if position.winner() == None else []
+                child = Node(move, node, other, _key(position, other), moves)
+                node.children.append(child)
+                node = child
+                depth += 1
+            self.depth = max(self.depth, depth)
+
+            # 3. playouts => a position without children and untried moves is over, its result is known at once
+            if not node.untried and not node.children:
+                winner = position.winner()
+                result = SIGN[winner] if winner != None else -SIGN[node.color]
+                total = result * self.batch
+            else:
+                total = 0
+                for i in range(self.batch):
+                    total += playout(position.copy(), node.color, rng)
+            self.nodes += self.batch
+
+            # 4. backup => every node scores the results for the side that moved into it
+            while node is not None:
+                node.visits += self.batch
+                node.score -= SIGN[node.color] * total
+                node = node.parent
+
+        self.root = root if self.reuse else None
+        return root
+
+    # Start from the node of this position if the last search already looked at it => our move and the reply are
+    # at most two plies below the old root
+    def _find_root(self, board, color):
+        key = _key(board, color)
+        if self.root is not None:
+            for node in [self.root] + self.root.children + [grandchild for child in self.root.children for grandchild in child.children]:
+                if node.key == key:
+                    node.parent = None
+                    node.move = None
+                    return node
+        return Node(None, None, color, key, board.get_move_list(color) if board.winner() == None else [])
+
+    # Root parallelism => every worker searches the same position with its own tree and random seed
+    def _think_parallel(self, board, color, time_ms, rollouts):
+        # The event is handed to the workers when they start => a process cannot receive it later with a task
+        if self.executor is None:
+            self.stop_event = multiprocessing.Event()
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(self.stop_event,))
+        self.stopped = False
+        self.stop_event.clear()
+
+        share = rollouts if rollouts is None or rollouts == math.inf else -(-rollouts // self.workers)
+        futures = [self.executor.submit(_root_visits, board, color, time_ms, share, self.batch, self.rng.getrandbits(32))
+                   for worker in range(self.workers)]
+
+        visits, scores = {}, {}
+        self.nodes = self.depth = 0
+        for future in futures:
+            children, nodes, depth = future.result()
+            self.nodes += nodes
+            self.depth = max(self.depth, depth)
+            for move, (count, score) in children.items():
+                visits[move] = visits.get(move, 0) + count
+                scores[move] = scores.get(move, 0.0) + score
+
+        if not visits:
+            moves = board.get_move_list(color)
+            return board.evaluate(), (moves[0] if moves else None), 0
+        move = max(visits, key=visits.get)
+        return SIGN[color] * scores[move] / visits[move], move, self.depth
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self.stop_event = None
+
+# Stop signal of a worker process => the parent's MCTS.stop_event, set by _init_worker()
+_stop_event = None
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+# Runs in a worker process => visits and score of every root move
+def _root_visits(board, color, time_ms, rollouts, batch, seed):
+    engine = MCTS(rollouts, batch, reuse=False, seed=seed)
+    engine.stop_event = _stop_event
+    root = engine._grow(board.copy(), color, time_ms, rollouts)
+    return {child.move: (child.visits, child.score) for child in root.children}, engine.nodes, engine.depth
+
+if __name__ == "__main__":
+    import sys
+    from checkers.board import Board
+
+    rollouts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROLLOUTS
+    for workers in (1, os.cpu_count() or 1):
+        engine = MCTS(rollouts, workers=workers, seed=0)
+        start = time.time()
+        score, move, depth = engine.think(Board(), False)
+        elapsed = time.time() - start
+        print("workers %2d: %6d playouts  %6.2fs  %7.0f playouts/sec  depth %d  score %+.2f  move %s"
+              % (workers, engine.nodes, elapsed, engine.nodes / elapsed, depth, score, move))
+        engine.close()
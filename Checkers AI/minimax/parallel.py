@@ -0,0 +1,115 @@
+# Parallel root-split search => the moves of the root position are shared out between worker processes
+#
+# 1. The first root move is searched with the full window => its score becomes alpha
+# 2. Every other root move is tested in parallel with a null window => can it beat alpha at all?
+# 3. The moves that can are searched again in parallel with the window (alpha, inf) to get their exact score
+# Moves are then compared in the same order as AlphaBeta.search() => same score and same move as the serial search
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from checkers.constants import RED, WHITE
+
+from .alphabeta import AlphaBeta, SIGN, INF, NULL_WINDOW, order_moves
+from .transposition import TranspositionTable
+
+# Search engine of a worker process => created once by _init_worker()
+_engine = None
+
+# size_mb => transposition table of each worker, 0 => no table (exactly the same result as the serial search)
+def _init_worker(size_mb, ordering):
+    global _engine
+    _engine = AlphaBeta(TranspositionTable(size_mb) if size_mb else None, ordering)
+
+# Runs in a worker process => return the score of 'move' and the number of positions searched
+def _score_move(board, move, depth, alpha, beta, color):
+    if _engine.table is not None:
+        _engine.table.new_search()
+    score = _engine.score_move(board, move, depth, alpha, beta, color)
+    return score, _engine.nodes
+
+class ParallelSearch:
+    # workers => number of processes, defaults to one per CPU core
+    # ordering => same meaning as for AlphaBeta => compare with an AlphaBeta made with the same setting
+    def __init__(self, workers=None, size_mb=0, ordering=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.ordering = ordering
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(size_mb, ordering))
+
+        # Positions searched by all the workers in the last search
+        self.nodes = 0
+
+    # Same arguments and result as AlphaBeta.search() => the score and the best move (src, dst, captured)
+    def search(self, board, depth, max_player):
+        self.nodes = 1
+        color = WHITE if max_player else RED
+        if depth==0 or board.winner() != None:
+            return board.evaluate(), None
+
+        moves = board.get_move_list(color)
+        moves.reverse()                 # same order as AlphaBeta.search()
+        if self.ordering:
+            order_moves(moves)
+        if not moves:
+            return -INF * SIGN[color], None
+        board = board.copy()
+
+        # 1. first move => full window
+        alpha, nodes = self.executor.submit(_score_move, board, moves[0], depth, -INF, INF, color).result()
+        self.nodes += nodes
+        scores = [alpha]
+
+        # 2. the other moves => null window tests (alpha, alpha + NULL_WINDOW), all at once
+        tests = [self.executor.submit(_score_move, board, move, depth, alpha, alpha + NULL_WINDOW, color) for move in moves[1:]]
+        for future in tests:
+            score, nodes = future.result()
+            self.nodes += nodes
+            scores.append(score)
+
+        # 3. moves that beat alpha => exact score
+        researches = {}
+        for i in range(1, len(moves)):
+            if scores[i] > alpha:
+                researches[i] = self.executor.submit(_score_move, board, moves[i], depth, alpha, INF, color)
+        for i, future in researches.items():
+            scores[i], nodes = future.result()
+            self.nodes += nodes
+
+        # Moves that failed the test scored at most alpha => they can never replace the first move
+        best, best_move = scores[0], moves[0]
+        for i in researches:
+            if scores[i] > best:
+                best, best_move = scores[i], moves[i]
+
+        return best * SIGN[color], best_move
+
+    # Stop the worker processes
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+# Time the serial search against the parallel one for a growing number of workers
+# python -m minimax.parallel [depth] [max workers]
+if __name__ == "__main__":
+    import sys
+    import time
+    from checkers.board import Board
+
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    engine = AlphaBeta()
+    start = time.time()
+    serial = engine.search(Board(), depth, False)
+    serial_time = time.time() - start
+    print("serial    : %.2fs, %d nodes, move %s" % (serial_time, engine.nodes, serial[1]))
+
+    workers = 1
+    while workers <= max_workers:
+        search = ParallelSearch(workers)
+        search.search(Board(), 1, False)        # start the worker processes before timing
+        start = time.time()
+        result = search.search(Board(), depth, False)
+        elapsed = time.time() - start
+        search.close()
+        print("%2d workers: %.2fs, %d nodes, speedup %.2fx, same move: %s" % (workers, elapsed, search.nodes, serial_time / elapsed, result == serial))
+        workers *= 2
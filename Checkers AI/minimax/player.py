@@ -0,0 +1,119 @@
+# AI player that thinks away from the main loop
+# The search runs in a worker process (or thread) while the main loop keeps drawing the window and reading events
+# The move comes back through a Future => the main loop checks it every frame and hands the new board to Game.ai_move()
+# A checkers.player.Player => Game.play() runs it like any other player
+#
+# A worker process has its own interpreter => the search never holds up the drawing, however deep it goes
+# A worker thread shares the interpreter with the window => simpler, but the search slows the frame rate down
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from checkers.constants import WHITE
+from checkers.player import NO_MOVE, Player
+
+from .book import OpeningBook
+from .engine import make_engine
+from .stats import SearchStats
+from .tablebase import Tablebase
+
+# Search engine of a worker process => created once by _init_worker() so its transposition table lasts the whole game
+_engine = None
+
+# Runs once in the worker process
+# stop_event => set by the main process to abort the running search
+# stats => record SearchStats of every search, log => JSON-lines file they are appended to
+def _init_worker(stop_event, engine, size_mb, tablebase=None, weights=None, stats=False, log=None):
+    global _engine
+    _engine = make_engine(engine, size_mb, tablebase=Tablebase(tablebase) if tablebase else None, weights=weights)
+    if stats or log:
+        _engine.stats = SearchStats(log)
+
+    def watch():
+        stop_event.wait()
+        _engine.stop()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+# Runs in the worker process => only the move (src, dst, captured) and the stats summary (or None) are sent back
+def _search(board, max_player, time_ms):
+    evaluation, best_move, depth = _engine.think(board, max_player, time_ms)
+    return best_move, _engine.stats.summary if _engine.stats else None
+
+class AIPlayer(Player):
+    # color => color the AI plays, time_ms => thinking time per move
+    # use_process => search in a separate process instead of a thread
+    # book => path of an opening book => positions found in it are played at once without searching
+    # tablebase => directory of endgame tablebases (see minimax.tablebase) used by the search
+    # engine => name of the engine that searches (see minimax.engine)
+    # weights => path of evaluation weights written by minimax.tuner, None => material only
+    # stats => keep the statistics of every search (see minimax.stats) in self.stats, log => also append them to
+    # this JSON-lines file
+    def __init__(self, color, time_ms, use_process=True, size_mb=32, book=None, tablebase=None, engine="alphabeta",
+                 weights=None, stats=False, log=None):
+        super().__init__(color)
+        self.time_ms = time_ms
+        self.use_process = use_process
+        self.book = OpeningBook(book) if book else None
+
+        # One worker => at most one search at a time
+        if use_process:
+            self.stop_event = multiprocessing.Event()
+            self.executor = ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(self.stop_event, engine, size_mb, tablebase, weights, stats, log))
+        else:
+            # Shared by every search of this player => earlier turns help later ones
+            self.engine = make_engine(engine, size_mb, tablebase=Tablebase(tablebase) if tablebase else None, weights=weights)
+            if stats or log:
+                self.engine.stats = SearchStats(log)
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+        self.future = None
+        self.board = None               # board the running search started from
+        self.stats = None               # summary dict of the last search, None => book move or stats are off
+
+    # Is a search running or a move waiting to be collected?
+    def thinking(self):
+        return self.future is not None
+
+    # Start searching for a move on (a copy of) 'board' => returns immediately
+    def start(self, board):
+        if self.future is None:
+            self.board = board.copy()
+            book_move = self.book.choose(self.board, self.color) if self.book else None
+            if book_move is not None:
+                self.future = Future()
+                self.future.set_result((book_move, None))
+            elif self.use_process:
+                self.future = self.executor.submit(_search, self.board, self.color==WHITE, self.time_ms)
+            else:
+                self.future = self.executor.submit(self._think, self.board.copy())
+        return self.future
+
+    # Runs in the worker thread
+    def _think(self, board):
+        evaluation, best_move, depth = self.engine.think(board, self.color==WHITE, self.time_ms)
+        return best_move, self.engine.stats.summary if self.engine.stats else None
+
+    # Return the new board once the search is done, None while it is still thinking, NO_MOVE if there was nothing to play
+    def get_move(self):
+        if self.future is None or not self.future.done():
+            return None
+
+        future, self.future = self.future, None
+        best_move, self.stats = future.result()
+        if best_move is None:
+            return NO_MOVE
+        self.board.apply_move(best_move)
+        return self.board
+
+    # Abort the search (if any) and wait for the worker to finish => call before quitting
+    def shutdown(self):
+        if self.use_process:
+            self.stop_event.set()
+        else:
+            self.engine.stop()
+        self.executor.shutdown(wait=True)
+        self.future = None
+        if self.book:
+            self.book.close()
@@ -0,0 +1,227 @@
+# Text engine protocol => run the AI as a standalone process that a GUI or a match server talks to line by line
+# over stdin/stdout, or over a local TCP socket (one engine per connection)
+#     python -m minimax.protocol                       => stdin/stdout
+#     python -m minimax.protocol --port 9000           => TCP on 127.0.0.1:9000
+# Nothing here imports pygame => starting an engine costs only the interpreter and the tables
+#
+# Commands (one per line, words separated by spaces):
+#   checkers                            => id name ..., id engine ..., then checkersok
+#   isready                             => readyok once the engine can take commands
+#   newgame                             => forget what the engine learned in the previous game
+#   position startpos [moves M1 M2 ...] => starting position, then the moves in PDN ("11-15", "9x18x27")
+#   position fen FEN [moves M1 M2 ...]  => position of a PDN FEN ("B:W21,22:B1,K5"), then the moves
+#   go [depth N] [time MS] [infinite]   => think about the position => info lines, then bestmove
+#   stop                                => end the running go at once => it still answers bestmove
+#   quit                                => stop and close
+#
+# Replies:
+#   info depth D score S nodes N time T pv M1 M2 ... => after every finished depth
+#   bestmove M                                        => "bestmove none" if the side to move has no move
+#   error TEXT                                        => a command that could not be understood
+#
+# Scores are from white's point of view like everywhere else in this engine (MCTS => expected result -1..1)
+# go without depth or time thinks until stop => "go infinite" says the same thing explicitly
+# MCTS has no depth => "go depth N" thinks until stop as well, only time ends it by itself
+
+import argparse
+import math
+import socketserver
+import sys
+import threading
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from checkers.pdn import find_move, parse_fen, parse_move, move_text
+
+from .engine import ENGINES, make_engine
+from .stats import SearchStats, score_text
+from .tablebase import Tablebase
+
+NAME = "Checkers AI"
+
+# SearchStats that also sends an info line every time a depth is finished
+class InfoStats(SearchStats):
+    def __init__(self, send):
+        super().__init__()
+        self.send = send
+
+    def iteration(self, depth, nodes, score, pv):
+        super().iteration(depth, nodes, score, pv)
+        info = self.iterations[-1]
+        self.send("info depth %d score %s nodes %d time %d pv %s"
+                  % (depth, score_text(info["score"]), nodes, info["time_ms"], " ".join(info["pv"])))
+
+# One engine and its position => reads command lines and answers through 'send' (a function taking one line)
+class Session:
+    # engine, size_mb, weights => see make_engine(), tablebase => directory of endgame tablebases
+    def __init__(self, send, engine="alphabeta", size_mb=16, weights=None, tablebase=None):
+        self.lock = threading.Lock()            # info and bestmove lines come from the search thread
+        self.out = send
+        self.name = engine
+        self.size_mb = size_mb
+        self.weights = weights
+        self.tablebase = Tablebase(tablebase) if tablebase else None
+        self.thread = None
+        self.engine = None
+        self.newgame([])
+
+    def send(self, line):
+        with self.lock:
+            self.out(line)
+
+    # Handle one command line => False once the session should close
+    def command(self, line):
+        words = line.split()
+        if not words:
+            return True
+        name, args = words[0], words[1:]
+
+        if name == "quit":
+            self.stop()
+            return False
+        if name == "stop":
+            self.stop()
+        elif name == "isready":
+            self.send("readyok")
+        elif name == "checkers":
+            self.send("id name %s" % NAME)
+            self.send("id engine %s" % self.name)
+            self.send("checkersok")
+        elif name in ("newgame", "position", "go"):
+            self.wait()                         # a new command waits for the search before it to finish
+            try:
+                getattr(self, name)(args)
+            except ValueError as error:
+                self.send("error %s" % error)
+        else:
+            self.send("error unknown command %s" % name)
+        return True
+
+    def newgame(self, args):
+        if hasattr(self.engine, "close"):
+            self.engine.close()
+        # No rollout limit => MCTS thinks until the time is up or stop arrives, never only DEFAULT_ROLLOUTS playouts
+        self.engine = make_engine(self.name, self.size_mb, tablebase=self.tablebase, rollouts=math.inf,
+                                  weights=self.weights)
+        self.engine.stats = InfoStats(self.send)
+        self.board, self.color = Board(), RED
+
+    def position(self, args):
+        if "moves" in args:
+            split = args.index("moves")
+            setup, moves = args[:split], args[split + 1:]
+        else:
+            setup, moves = args, []
+
+        if setup == ["startpos"]:
+            board, color = Board(), RED
+        elif len(setup) == 2 and setup[0] == "fen":
+            board, color = parse_fen(setup[1])
+        else:
+            raise ValueError("expected position startpos or position fen FEN")
+
+        for text in moves:
+            move = find_move(board, color, parse_move(text))
+            if move is None:
+                raise ValueError("illegal move %s" % text)
+            board.apply_move(move)
+            color = WHITE if color==RED else RED
+        self.board, self.color = board, color
+
+    def go(self, args):
+        depth, time_ms = None, float('inf')
+        words = iter(args)
+        for word in words:
+            if word == "depth":
+                depth = int(next(words, ""))
+            elif word == "time":
+                time_ms = int(next(words, ""))
+            elif word != "infinite":
+                raise ValueError("unknown go option %s" % word)
+
+        self.thread = threading.Thread(target=self._think, args=(self.board.copy(), self.color, time_ms, depth), daemon=True)
+        self.thread.start()
+
+    # Runs in the search thread
+    def _think(self, board, color, time_ms, depth):
+        if depth is None:
+            score, move, reached = self.engine.think(board, color==WHITE, time_ms)
+        else:
+            score, move, reached = self.engine.think(board, color==WHITE, time_ms, depth)
+        self.send("bestmove %s" % (move_text(move) if move is not None else "none"))
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    # The search may not have started yet when stop arrives (and starting clears the flag) => keep asking until it ends
+    def stop(self):
+        while self.thread is not None and self.thread.is_alive():
+            self.engine.stop()
+            self.thread.join(0.05)
+        self.thread = None
+
+    def close(self):
+        self.stop()
+        if hasattr(self.engine, "close"):
+            self.engine.close()
+        if self.tablebase:
+            self.tablebase.close()
+
+# stdin/stdout => one session for the life of the process
+def serve_stdio(**options):
+    def send(line):
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+    session = Session(send, **options)
+    try:
+        for line in sys.stdin:
+            if not session.command(line):
+                break
+    finally:
+        session.close()
+
+# TCP => every connection gets its own session (engine, transposition table and position)
+def serve_tcp(host, port, **options):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def send(line):
+                self.wfile.write((line + "\n").encode())
+                self.wfile.flush()
+
+            session = Session(send, **options)
+            try:
+                for line in self.rfile:
+                    if not session.command(line.decode(errors="replace")):
+                        break
+            finally:
+                session.close()
+
+    class Server(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    with Server((host, port), Handler) as server:
+        server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the checkers AI as a text protocol engine")
+    parser.add_argument("--engine", choices=ENGINES, default="alphabeta")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size in MB")
+    parser.add_argument("--weights", help="evaluation weights file (see minimax.tuner)")
+    parser.add_argument("--tablebase", help="directory of endgame tablebases (see minimax.tablebase)")
+    parser.add_argument("--port", type=int, default=0, help="listen on this TCP port instead of stdin/stdout")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on with --port")
+    args = parser.parse_args()
+
+    options = dict(engine=args.engine, size_mb=args.hash, weights=args.weights, tablebase=args.tablebase)
+
+    if args.port:
+        serve_tcp(args.host, args.port, **options)
+    else:
+        serve_stdio(**options)
+
+if __name__ == "__main__":
+    main()
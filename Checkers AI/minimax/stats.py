@@ -0,0 +1,80 @@
+# Search statistics => what an engine did to find one move
+# Off unless an engine gets one => engine.stats = SearchStats() => the search itself only fills it in once per
+# iteration, so a search without it costs exactly what it did before
+#
+# Per search  => nodes, depth reached, time, nodes/sec, transposition table hit rate, beta cutoffs, score, PV
+# Per depth   => nodes, time, score and PV when that iteration finished, branching factor against the depth before
+# log => path of a JSON-lines file => every finished search is appended as one line
+
+import json
+import math
+import time
+
+from checkers.pdn import move_text
+
+class SearchStats:
+    def __init__(self, log=None):
+        self.log = log
+        self.summary = None             # dict of the last finished search => what the overlay and the log show
+        self.begin(None)
+
+    # Called by the engine when a search starts
+    def begin(self, engine):
+        self.start = time.time()
+        self.iterations = []
+        table = getattr(engine, "table", None)
+        self.tt_probes, self.tt_hits = (table.probes, table.hits) if table is not None else (0, 0)
+
+    # Called by the engine every time a depth is finished => 'nodes' counts from the start of the search
+    def iteration(self, depth, nodes, score, pv):
+        done = self.iterations[-1]["nodes"] if self.iterations else 0
+        self.iterations.append({
+            "depth": depth,
+            "nodes": nodes,
+            "iteration_nodes": nodes - done,
+            "time_ms": round(1000 * (time.time() - self.start), 1),
+            "score": finite(score),
+            "pv": [move_text(move) for move in pv],
+        })
+
+    # Called by the engine when the search is over => returns the summary
+    def finish(self, engine, depth, score, move):
+        elapsed = time.time() - self.start
+        table = getattr(engine, "table", None)
+        probes = table.probes - self.tt_probes if table is not None else 0
+        hits = table.hits - self.tt_hits if table is not None else 0
+
+        # Effective branching factor => how many times more positions each depth took than the one before it
+        branching = None
+        if len(self.iterations) >= 2 and self.iterations[-2]["iteration_nodes"]:
+            branching = round(self.iterations[-1]["iteration_nodes"] / self.iterations[-2]["iteration_nodes"], 2)
+
+        self.summary = {
+            "nodes": engine.nodes,
+            "depth": depth,
+            "time_ms": round(1000 * elapsed, 1),
+            "nps": round(engine.nodes / elapsed) if elapsed else 0,
+            "tt_hit_rate": round(hits / probes, 3) if probes else None,
+            "cutoffs": getattr(engine, "cutoffs", None),
+            "branching": branching,
+            "score": finite(score),
+            "move": move_text(move) if move is not None else None,
+            "pv": self.iterations[-1]["pv"] if self.iterations else [],
+            "iterations": self.iterations,
+        }
+        if self.log:
+            with open(self.log, "a") as f:
+                f.write(json.dumps(self.summary) + "\n")
+        return self.summary
+
+# JSON has no infinity => a won or lost position is written as +-1e9
+def finite(score):
+    if score is None or math.isfinite(score):
+        return score
+    return math.copysign(1e9, score)
+
+# Score as text => "win" / "loss" for a won or lost position, otherwise in pieces
+def score_text(score):
+    if abs(score) >= 1e9:
+        return "win" if score > 0 else "loss"
+    return "%+.2f" % score
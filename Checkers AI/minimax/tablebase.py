@@ -0,0 +1,312 @@
+# Endgame tablebases => every position with few pieces left solved as a win, loss or draw
+# Material only (Board.evaluate()) cannot tell a won ending from a drawn one => with a tablebase the search knows,
+# and knows how many moves the win takes, so it plays the quickest win instead of shuffling kings around
+#
+# One file per material signature (red kings, red men, white kings, white men) => "1-1-1-0.tb"
+#   header  => b"CKTB1\0\0\0", the 4 piece counts (uint8), 4 bytes padding     => 16 bytes
+#   body    => one byte per position, position index * 2 + (1 if white is to move)
+#              0 => draw (or not a real position), 1..127 => win in that many plies,
+#              128 + n => loss in n plies (capped at 127)
+#
+# Build:  python -m minimax.tablebase --pieces 3 --output tablebase
+# 4 pieces takes a long time in pure python => 3 is the default
+
+import mmap
+import os
+import struct
+from collections import OrderedDict, defaultdict
+from itertools import combinations
+from math import comb
+
+from checkers.bitboard import FULL, RED_CROWN, WHITE_CROWN, bits, popcount
+from checkers.constants import RED, WHITE
+
+MAGIC = b"CKTB1\0\0\0"
+HEADER = struct.Struct("<8s4B4x")
+
+WIN, LOSS, DRAW = 1, -1, 0
+MAX_DISTANCE = 127
+
+# Search score of a tablebase win => far above any material score, quicker wins score higher
+TB_WIN = 1000
+
+# Size of the pages the reader keeps in its LRU cache
+PAGE_SIZE = 4096
+
+def encode(value, distance):
+    distance = min(distance, MAX_DISTANCE)
+    return distance if value == WIN else 128 + distance
+
+def decode(byte):
+    if byte == 0:
+        return DRAW, 0
+    if byte < 128:
+        return WIN, byte
+    return LOSS, byte - 128
+
+# Material signature of a position => (red kings, red men, white kings, white men)
+def signature(red, white, kings):
+    return (popcount(red & kings), popcount(red & ~kings), popcount(white & kings), popcount(white & ~kings))
+
+def file_name(sig):
+    return "%d-%d-%d-%d.tb" % sig
+
+# Colex rank of a set of squares => every k squares out of 32 get a number from 0 to comb(32, k) - 1
+def rank(mask):
+    total = 0
+    for i, bit in enumerate(bits(mask)):
+        total += comb(bit.bit_length() - 1, i + 1)
+    return total
+
+# Index of a position (without the side to move) inside the table of its signature
+# every piece group is ranked among all 32 squares => positions with two pieces on one square waste a slot, but the
+# index needs no tables and the file stays small for the piece counts we can generate
+def position_index(sig, red, white, kings):
+    rk, rm, wk, wm = sig
+    index = rank(red & kings)
+    index = index * comb(32, rm) + rank(red & ~kings)
+    index = index * comb(32, wk) + rank(white & kings)
+    return index * comb(32, wm) + rank(white & ~kings)
+
+def table_size(sig):
+    size = 2
+    for count in sig:
+        size *= comb(32, count)
+    return size
+
+class Tablebase:
+    # directory => where the .tb files are, cache_pages => number of 4KB pages kept in the LRU cache
+    def __init__(self, directory, cache_pages=256):
+        self.directory = directory
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()          # (signature, page number) => bytes of that page
+        self.files = {}                     # signature => mmap, None if there is no file for it
+        self.hits = self.misses = 0
+
+        # Most pieces of any table in the directory => positions with more pieces are not probed
+        self.max_pieces = 0
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith(".tb"):
+                    self.max_pieces = max(self.max_pieces, sum(int(count) for count in name[:-3].split("-")))
+
+    def _open(self, sig):
+        if sig not in self.files:
+            path = os.path.join(self.directory, file_name(sig))
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    self.files[sig] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.files[sig] = None
+        return self.files[sig]
+
+    # Byte stored for position 'index' of table 'sig' => read through the page cache
+    def _read(self, sig, index):
+        data = self._open(sig)
+        if data is None:
+            return None
+
+        offset = HEADER.size + index
+        key = (sig, offset // PAGE_SIZE)
+        page = self.cache.get(key)
+        if page is None:
+            self.misses += 1
+            start = key[1] * PAGE_SIZE
+            page = data[start:start + PAGE_SIZE]
+            self.cache[key] = page
+            if len(self.cache) > self.cache_pages:
+                self.cache.popitem(last=False)          # least recently used page
+        else:
+            self.hits += 1
+            self.cache.move_to_end(key)
+        return page[offset % PAGE_SIZE]
+
+    # (WIN/LOSS/DRAW, distance in plies) for the side to move, None if the position is not in the tablebase
+    def probe_bits(self, red, white, kings, color):
+        if not red or not white or popcount(red | white) > self.max_pieces:
+            return None
+        sig = signature(red, white, kings)
+        byte = self._read(sig, position_index(sig, red, white, kings) * 2 + (color == WHITE))
+        return None if byte is None else decode(byte)
+
+    def probe(self, board, color):
+        return self.probe_bits(board.red, board.white, board.kings, color)
+
+    # Score for the search from the side to move, None if the position is not in the tablebase
+    # a side without pieces has lost right now => scores more than any win that still has to be played out
+    # ply => distance from the root of the search => a win further away from the root scores less, so the search
+    # prefers the shortest win (and the longest loss) like it does with the distance stored in the table
+    def score(self, board, color, ply=0):
+        own, opponent = (board.red, board.white) if color==RED else (board.white, board.red)
+        if not own:
+            return -(TB_WIN - ply)
+        if not opponent:
+            return TB_WIN - ply
+
+        result = self.probe(board, color)
+        if result is None:
+            return None
+        value, distance = result
+        if value == DRAW:
+            return 0
+        return (TB_WIN - distance - ply) * value
+
+    def close(self):
+        for data in self.files.values():
+            if data is not None:
+                data.close()
+        self.files = {}
+        self.cache.clear()
+
+# Masks of every way to put 'count' pieces on the squares of 'allowed'
+def _groups(count, allowed):
+    groups = []
+    for squares in combinations(range(32), count):
+        mask = sum(1 << square for square in squares)
+        if mask & ~allowed == 0:
+            groups.append(mask)
+    return groups
+
+# Every real position of a signature => (red, white, kings)
+def placements(sig):
+    rk, rm, wk, wm = sig
+    red_men = _groups(rm, FULL & ~RED_CROWN)            # a man on its crowning row would already be a king
+    white_men = _groups(wm, FULL & ~WHITE_CROWN)
+    red_kings, white_kings = _groups(rk, FULL), _groups(wk, FULL)
+    for a in red_kings:
+        for b in red_men:
+            if a & b:
+                continue
+            for c in white_kings:
+                if (a | b) & c:
+                    continue
+                for d in white_men:
+                    if (a | b | c) & d:
+                        continue
+                    yield a | b, c | d, a | c
+
+# Retrograde analysis of one signature => writes its file and returns its name
+# Tables with fewer pieces (captures) and fewer men (promotions) must already be in 'directory'
+#
+# 1. Every position is generated once => positions without a move are lost, moves into other tables are looked up,
+#    moves inside this table are remembered backwards (child => parents)
+# 2. Results spread backwards from the solved positions in order of distance:
+#    a child that is lost => the parent wins, every child won => the parent is lost
+# 3. Whatever is left can never be forced either way => draw
+def generate(directory, sig):
+    from checkers.board import Board
+
+    reader = Tablebase(directory)
+    reader.max_pieces = sum(sig)
+    board = Board()
+
+    parents = defaultdict(list)
+    unsolved = {}                           # position => children not known to be won for the opponent
+    longest_win = {}                        # position => longest win of the opponent among solved children
+    buckets = defaultdict(list)             # distance => [(position, value), ...] waiting to be solved
+
+    for red, white, kings in placements(sig):
+        base = position_index(sig, red, white, kings) * 2
+        for side, color in ((0, RED), (1, WHITE)):
+            index = base + side
+            other = WHITE if color==RED else RED
+            board.set_position(red, white, kings)
+
+            moves = board.get_move_list(color)
+            if not moves:
+                buckets[0].append((index, LOSS))
+                continue
+
+            count, longest, best_win = 0, -1, None
+            for move in moves:
+                undo = board.apply_move(move)
+                if not (board.red if other==RED else board.white):
+                    result = (LOSS, 0)              # captured the last piece
+                elif signature(board.red, board.white, board.kings) == sig:
+                    result = None
+                    parents[position_index(sig, board.red, board.white, board.kings) * 2 + (other == WHITE)].append(index)
+                    count += 1
+                else:
+                    result = reader.probe(board, other)
+                board.undo_move(undo)
+
+                if result is None:
+                    continue
+                value, distance = result
+                if value == WIN:
+                    longest = max(longest, distance)
+                    continue
+
+                # A winning move or a draw => this position can never be lost
+                count += 1
+                if value == LOSS:
+                    best_win = distance + 1 if best_win is None else min(best_win, distance + 1)
+
+            unsolved[index] = count
+            longest_win[index] = longest
+            if best_win is not None:
+                buckets[best_win].append((index, WIN))
+            elif count == 0:
+                buckets[longest + 1].append((index, LOSS))
+
+    table = bytearray(table_size(sig))
+    solved = set()
+    while buckets:
+        distance = min(buckets)
+        for index, value in buckets.pop(distance):
+            if index in solved:
+                continue
+            solved.add(index)
+            table[index] = encode(value, distance)
+
+            for parent in parents.get(index, ()):
+                if parent in solved:
+                    continue
+                if value == LOSS:
+                    buckets[distance + 1].append((parent, WIN))
+                else:
+                    unsolved[parent] -= 1
+                    longest_win[parent] = max(longest_win[parent], distance)
+                    if unsolved[parent] == 0:
+                        buckets[longest_win[parent] + 1].append((parent, LOSS))
+
+    reader.close()
+    path = os.path.join(directory, file_name(sig))
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, *sig))
+        f.write(table)
+    os.replace(path + ".tmp", path)
+    return file_name(sig)
+
+# Every signature with at most 'pieces' pieces and at least one piece per side, grouped so that each group only
+# depends on the groups before it => (fewer pieces first, then fewer men)
+def generation_order(pieces):
+    levels = defaultdict(list)
+    for total in range(2, pieces + 1):
+        for red in range(1, total):
+            white = total - red
+            for rm in range(red + 1):
+                for wm in range(white + 1):
+                    levels[(total, rm + wm)].append((red - rm, rm, white - wm, wm))
+    return [levels[key] for key in sorted(levels)]
+
+# Generate all the tables up to 'pieces' pieces => the signatures of one level are solved in parallel
+def generate_all(directory, pieces, workers=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(directory, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for level in generation_order(pieces):
+            todo = [sig for sig in level if not os.path.exists(os.path.join(directory, file_name(sig)))]
+            for name in executor.map(generate, [directory] * len(todo), todo):
+                print(name)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate win/loss/draw endgame tablebases")
+    parser.add_argument("--pieces", type=int, default=3, help="largest number of pieces on the board")
+    parser.add_argument("--output", default="tablebase", help="directory for the .tb files")
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 => one per CPU core)")
+    args = parser.parse_args()
+    generate_all(args.output, args.pieces, args.workers or None)
@@ -0,0 +1,191 @@
+# Self-play tournament => engine A plays engine B for a number of games spread over a process pool
+# Every opening is played twice with the colors swapped => neither engine gets the easier side more often
+#
+# python -m minimax.tournament --games 100 --time-a 200 --time-b 200 --depth-b 4 --random-plies 4
+# python -m minimax.tournament --games 20 --time-a 500 --time-b 500 --engine-b mcts    <= same time budget, other engine
+# prints a JSON report => win/draw/loss for engine A, Elo difference with a 95% error bar, nodes/sec,
+# average depth reached and average time per move for both engines
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from .alphabeta import MAX_DEPTH
+from .engine import ENGINES, make_engine
+
+# A game is a draw after this many plies in total, or this many plies without a capture or a man moving
+MAX_PLIES = 300
+QUIET_PLIES = 80
+
+# Engine settings of one side => (time per move in ms, maximum depth, quiescence search on/off, engine name,
+# playouts per move for MCTS, weights file) => 0 means no limit
+def engine_settings(time_ms, depth, quiescence=True, engine="alphabeta", rollouts=0, weights=None):
+    return (time_ms if time_ms else float('inf'), depth if depth else MAX_DEPTH, quiescence, engine, rollouts or None, weights)
+
+# Play 'random_plies' random moves from the starting position => the opening of a game pair
+def random_opening(random_plies, seed):
+    rng = random.Random(seed)
+    board, color, moves = Board(), RED, []
+    for ply in range(random_plies):
+        legal = board.get_move_list(color)
+        if not legal:
+            break
+        move = rng.choice(legal)
+        board.apply_move(move)
+        moves.append(move)
+        color = WHITE if color==RED else RED
+    return moves
+
+# Play one game => 'a_color' is the color engine A plays
+# return the score of engine A (1 win, 0.5 draw, 0 loss) and the move statistics of both engines
+def play_game(opening, a_color, settings_a, settings_b, size_mb):
+    settings = {a_color: settings_a, (WHITE if a_color==RED else RED): settings_b}
+    engines = {color: make_engine(settings[color][3], size_mb, quiescence=settings[color][2], rollouts=settings[color][4],
+                                  weights=settings[color][5])
+               for color in (RED, WHITE)}
+    stats = {color: {"moves": 0, "nodes": 0, "time": 0.0, "depth": 0} for color in (RED, WHITE)}
+
+    board, color = Board(), RED
+    for move in opening:
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+
+    plies = quiet = 0
+    winner = None
+    while plies < MAX_PLIES and quiet < QUIET_PLIES:
+        if board.winner() != None:
+            winner = board.winner()
+            break
+
+        time_ms, depth, quiescence, name, rollouts, weights = settings[color]
+        engine = engines[color]
+        start = time.time()
+        evaluation, move, reached = engine.think(board, color==WHITE, time_ms, depth)
+        elapsed = time.time() - start
+
+        if move is None:                # no legal move => lost
+            winner = WHITE if color==RED else RED
+            break
+
+        side = stats[color]
+        side["moves"] += 1
+        side["nodes"] += engine.nodes
+        side["time"] += elapsed
+        side["depth"] += reached
+
+        # Captures and men moving cannot be undone => they reset the draw counter
+        quiet = 0 if move[2] or not board.kings & move[0] else quiet + 1
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+        plies += 1
+
+    if winner is None:
+        score = 0.5
+    else:
+        score = 1.0 if winner==a_color else 0.0
+    return score, stats[a_color], stats[WHITE if a_color==RED else RED]
+
+# Elo difference for a score fraction
+def elo(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+# JSON has no infinity => an Elo that cannot be measured (all games won or all lost) is reported as null
+def finite(value):
+    return value if math.isfinite(value) else None
+
+# Sum the statistics of one engine over all its games
+def summarize(sides):
+    moves = sum(side["moves"] for side in sides)
+    nodes = sum(side["nodes"] for side in sides)
+    seconds = sum(side["time"] for side in sides)
+    return {
+        "moves": moves,
+        "nodes": nodes,
+        "nodes_per_second": nodes / seconds if seconds else 0.0,
+        "average_depth": sum(side["depth"] for side in sides) / moves if moves else 0.0,
+        "average_time_ms": 1000 * seconds / moves if moves else 0.0,
+    }
+
+def run(games, settings_a, settings_b, random_plies=4, seed=0, workers=None, size_mb=16):
+    jobs = []
+    for i in range(games):
+        opening = random_opening(random_plies, seed + i//2)
+        jobs.append((opening, RED if i%2==0 else WHITE, settings_a, settings_b, size_mb))
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(play_game, *zip(*jobs)))
+    elapsed = time.time() - start
+
+    scores = [score for score, a, b in results]
+    wins, draws, losses = scores.count(1.0), scores.count(0.5), scores.count(0.0)
+    mean = sum(scores) / games
+
+    # 95% confidence interval of the score => turned into an Elo error bar
+    deviation = math.sqrt(sum((score - mean) ** 2 for score in scores) / games)
+    margin = 1.96 * deviation / math.sqrt(games)
+    low, high = elo(mean - margin), elo(mean + margin)
+
+    return {
+        "games": games,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "score": mean,
+        "elo": finite(elo(mean)),
+        "elo_error": finite((high - low) / 2),
+        "elo_interval": [finite(low), finite(high)],
+        "engine_a": summarize([a for score, a, b in results]),
+        "engine_b": summarize([b for score, a, b in results]),
+        "seconds": elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play engine A against engine B and report the result as JSON")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--time-a", type=int, default=100, help="ms per move for engine A (0 => depth only)")
+    parser.add_argument("--time-b", type=int, default=100, help="ms per move for engine B (0 => depth only)")
+    parser.add_argument("--depth-a", type=int, default=0, help="maximum depth for engine A (0 => time only)")
+    parser.add_argument("--depth-b", type=int, default=0, help="maximum depth for engine B (0 => time only)")
+    parser.add_argument("--plain-a", action="store_true", help="engine A evaluates at depth 0 without quiescence search")
+    parser.add_argument("--plain-b", action="store_true", help="engine B evaluates at depth 0 without quiescence search")
+    parser.add_argument("--engine-a", choices=ENGINES, default="alphabeta")
+    parser.add_argument("--engine-b", choices=ENGINES, default="alphabeta")
+    parser.add_argument("--rollouts-a", type=int, default=0, help="MCTS playouts per move for engine A (0 => time only)")
+    parser.add_argument("--rollouts-b", type=int, default=0, help="MCTS playouts per move for engine B (0 => time only)")
+    parser.add_argument("--weights-a", help="evaluation weights file for engine A (see minimax.tuner)")
+    parser.add_argument("--weights-b", help="evaluation weights file for engine B (see minimax.tuner)")
+    parser.add_argument("--random-plies", type=int, default=4, help="random opening moves before the engines take over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 => one per CPU core)")
+    parser.add_argument("--hash", type=int, default=16, help="transposition table size of each engine in MB")
+    parser.add_argument("--output", help="write the JSON report to this file instead of printing it")
+    args = parser.parse_args()
+
+    if not (args.time_a or args.depth_a or args.rollouts_a) or not (args.time_b or args.depth_b or args.rollouts_b):
+        parser.error("every engine needs a time, depth or rollout limit")
+
+    report = run(args.games, engine_settings(args.time_a, args.depth_a, not args.plain_a, args.engine_a, args.rollouts_a, args.weights_a),
+                 engine_settings(args.time_b, args.depth_b, not args.plain_b, args.engine_b, args.rollouts_b, args.weights_b),
+                 args.random_plies, args.seed, args.workers or None, args.hash)
+    report["settings"] = vars(args)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
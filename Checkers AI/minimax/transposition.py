@@ -0,0 +1,76 @@
+# Transposition table => remember positions that were already searched
+# The same position is reached through different move orders => look it up instead of searching it again
+#
+# Fixed-size table indexed by the low bits of the Zobrist hash
+# entry => (hash, depth, bound, score, best move, generation)
+
+# Bound types => what the stored score means
+EXACT = 0               # score is the real score of the position
+LOWER = 1               # search failed high (beta cutoff) => real score is at least this
+UPPER = 2               # search failed low => real score is at most this
+
+# Rough size of one entry in bytes => tuple + its hash, score and move objects + the slot in the list
+ENTRY_SIZE = 200
+
+class TranspositionTable:
+    # size_mb => memory cap => the number of slots is the largest power of 2 that fits in it
+    def __init__(self, size_mb=16):
+        slots = 1
+        while slots * 2 * ENTRY_SIZE <= size_mb * 1024 * 1024:
+            slots *= 2
+        self.mask = slots - 1
+        self.table = [None] * slots
+
+        # Incremented by new_search() => entries from older searches are replaced first
+        self.generation = 0
+
+        # Hit rate statistics
+        self.probes = self.hits = 0
+
+    # Number of entries the table can hold
+    def __len__(self):
+        return len(self.table)
+
+    # Call once per move => entries left over from the previous move become the first ones to be replaced
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.table = [None] * len(self.table)
+        self.generation = 0
+        self.probes = self.hits = 0
+
+    # Return the entry stored for 'key' or None
+    def probe(self, key):
+        self.probes += 1
+        entry = self.table[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    # Same as probe() without counting it => for looking at the table from outside the search (the PV)
+    def peek(self, key):
+        entry = self.table[key & self.mask]
+        return entry if entry is not None and entry[0] == key else None
+
+    # Replacement policy => the slot is overwritten if it is empty, holds the same position,
+    # is left over from an older search or was searched less deep than the new entry
+    def store(self, key, depth, bound, score, move):
+        index = key & self.mask
+        old = self.table[index]
+        if old is None or old[0] == key or old[5] != self.generation or old[1] <= depth:
+            # Keep the old best move if the new search found none => still the best guess for move ordering
+            if move is None and old is not None and old[0] == key:
+                move = old[4]
+            self.table[index] = (key, depth, bound, score, move, self.generation)
+
+    # Fraction of probes that found their position
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    # Fraction of slots in use
+    @property
+    def usage(self):
+        return sum(1 for entry in self.table if entry is not None) / len(self.table)
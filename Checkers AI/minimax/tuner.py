@@ -0,0 +1,220 @@
+# Texel tuning => fit the evaluation weights (see minimax.evaluation) to the results of real games
+# Every position of a game is labelled with how the game ended (white's point of view: 1 win, 0.5 draw, 0 loss)
+# predicted result => sigmoid(K * score) => the weights that predict the results best give the best evaluation
+#
+# 1. build => write the quiet positions of games (self-play and/or PDN files) to a dataset file
+#      python -m minimax.tuner build --games 500 --pdn games.pdn --output positions.bin
+# 2. tune  => gradient descent on the mean squared error, written to a weights file the engine loads
+#      python -m minimax.tuner tune --data positions.bin --output weights.json
+#
+# Dataset => records of (red, white, kings as uint32, result as float32) => 16 bytes each, no header
+# The dataset is never loaded whole => every pass reads it in chunks of --chunk positions, spread over a process pool
+
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from checkers.constants import RED, WHITE
+
+from .evaluation import FEATURES, MATERIAL, features_batch, save_weights
+
+RECORD = np.dtype([("red", "<u4"), ("white", "<u4"), ("kings", "<u4"), ("result", "<f4")])
+
+# Result of a game from white's point of view
+RESULTS = {WHITE: 1.0, RED: 0.0, None: 0.5}
+PDN_RESULTS = {"1-0": 0.0, "0-1": 1.0, "1/2-1/2": 0.5}          # 1-0 => the side that moved first (red) won
+
+# Positions where the side to move can capture are about to change => their score says little about the result
+def quiet(board, color):
+    return not board.get_capture_list(color)
+
+# One self-play game => [(red, white, kings), ...] of its quiet positions and the result
+def self_play_positions(seed, depth, random_plies, max_plies=200):
+    from checkers.board import Board
+    from .alphabeta import AlphaBeta
+    from .transposition import TranspositionTable
+
+    rng = random.Random(seed)
+    engine = AlphaBeta(TranspositionTable(8))
+    board, color = Board(), RED
+    positions, winner = [], None
+    for ply in range(max_plies):
+        if board.winner() != None:
+            winner = board.winner()
+            break
+        moves = board.get_move_list(color)
+        if not moves:
+            winner = WHITE if color==RED else RED
+            break
+
+        if ply >= random_plies and quiet(board, color):
+            positions.append((board.red, board.white, board.kings))
+        if ply < random_plies:
+            move = rng.choice(moves)
+        else:
+            evaluation, move = engine.search(board, depth, color==WHITE)
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+    return positions, RESULTS[winner]
+
+# Quiet positions and results of every finished game in a PDN file
+def pdn_positions(path):
+    from checkers.pdn import read_games, replay, start_position
+
+    with open(path) as f:
+        for headers, moves, result in read_games(f):
+            if result in PDN_RESULTS:
+                positions = [(board.red, board.white, board.kings) for board, color, move in replay(moves, *start_position(headers)) if quiet(board, color)]
+                yield positions, PDN_RESULTS[result]
+
+def write_records(f, positions, result):
+    records = np.zeros(len(positions), dtype=RECORD)
+    if positions:
+        records["red"], records["white"], records["kings"] = np.array(positions, dtype=np.uint32).T
+        records["result"] = result
+    records.tofile(f)
+    return len(records)
+
+def dataset_size(path):
+    return os.path.getsize(path) // RECORD.itemsize
+
+# Read 'count' positions starting at position 'start' => only this chunk is ever in memory
+def read_chunk(path, start, count):
+    with open(path, "rb") as f:
+        f.seek(start * RECORD.itemsize)
+        records = np.fromfile(f, dtype=RECORD, count=count)
+    positions = np.stack([records["red"], records["white"], records["kings"]], axis=1)
+    return positions, records["result"].astype(np.float64)
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+# Runs in a worker process => squared error and its gradient summed over one chunk
+# gradient => d error / d weight for every weight
+def chunk_error(path, start, count, weights, k):
+    positions, results = read_chunk(path, start, count)
+    features = features_batch(positions)
+    predicted = sigmoid(k * (features @ weights))
+    difference = predicted - results
+    gradient = (2 * k * difference * predicted * (1 - predicted)) @ features
+    return float(difference @ difference), gradient, len(results)
+
+class Tuner:
+    # chunk => positions read at a time by one worker, workers => processes (None => one per CPU core)
+    def __init__(self, path, chunk=1 << 18, workers=None):
+        self.path = path
+        self.size = dataset_size(path)
+        self.chunk = chunk
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+    # Mean squared error and its gradient over the whole dataset => one pass over the file
+    def error(self, weights, k):
+        starts = range(0, self.size, self.chunk)
+        futures = [self.executor.submit(chunk_error, self.path, start, self.chunk, weights, k) for start in starts]
+        total, gradient, count = 0.0, np.zeros(len(weights)), 0
+        for future in futures:
+            chunk_total, chunk_gradient, chunk_count = future.result()
+            total += chunk_total
+            gradient += chunk_gradient
+            count += chunk_count
+        return total / count, gradient / count
+
+    # Scaling constant K of the sigmoid => chosen once for the starting weights, then kept fixed
+    # (the error only depends on K * weights => tuning both would have no single answer)
+    def fit_k(self, weights, low=0.05, high=5.0):
+        # Golden section search => the error is smooth with a single minimum in K
+        ratio = (math.sqrt(5) - 1) / 2
+        a, b = low, high
+        for i in range(30):
+            c, d = b - ratio * (b - a), a + ratio * (b - a)
+            if self.error(weights, c)[0] < self.error(weights, d)[0]:
+                b = d
+            else:
+                a = c
+        return (a + b) / 2
+
+    # Gradient descent with momentum => return the weights and the error history
+    def tune(self, weights, k, epochs=200, rate=1.0, momentum=0.9, log=None):
+        weights = np.array(weights, dtype=np.float64)
+        velocity = np.zeros_like(weights)
+        history = []
+        for epoch in range(epochs):
+            error, gradient = self.error(weights, k)
+            history.append(error)
+            if log:
+                log("epoch %4d  error %.6f  %s" % (epoch, error, " ".join("%s=%.4f" % item for item in zip(FEATURES, weights))))
+            velocity = momentum * velocity - rate * gradient
+            weights += velocity
+        return weights, history
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+def build(args):
+    positions = 0
+    with open(args.output, "wb") as f:
+        for path in args.pdn:
+            for game, result in pdn_positions(path):
+                positions += write_records(f, game, result)
+
+        if args.games:
+            with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as executor:
+                seeds = range(args.seed, args.seed + args.games)
+                n = args.games
+                for game, result in executor.map(self_play_positions, seeds, [args.depth] * n, [args.random_plies] * n):
+                    positions += write_records(f, game, result)
+    print("%d positions written to %s" % (positions, args.output))
+
+def tune(args):
+    tuner = Tuner(args.data, args.chunk, args.workers or None)
+    try:
+        weights = MATERIAL.copy()
+        k = args.k or tuner.fit_k(weights)
+        start = tuner.error(weights, k)[0]
+        print("%d positions, K = %.4f, error with material weights %.6f" % (tuner.size, k, start))
+
+        weights, history = tuner.tune(weights, k, args.epochs, args.rate, log=print if args.verbose else None)
+        error = tuner.error(weights, k)[0]
+    finally:
+        tuner.close()
+
+    save_weights(args.output, weights, k=k, error=error, start_error=start, positions=tuner.size)
+    print("error %.6f => %.6f, weights written to %s" % (start, error, args.output))
+    for feature, weight in zip(FEATURES, weights):
+        print("  %-12s %8.4f" % (feature, weight))
+
+def main():
+    parser = argparse.ArgumentParser(description="Texel tuning of the evaluation weights")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_build = commands.add_parser("build", help="write the positions of games to a dataset file")
+    parser_build.add_argument("--output", default="positions.bin")
+    parser_build.add_argument("--games", type=int, default=0, help="self-play games to play")
+    parser_build.add_argument("--depth", type=int, default=4, help="search depth of the self-play engine")
+    parser_build.add_argument("--random-plies", type=int, default=6, help="random moves at the start of every self-play game")
+    parser_build.add_argument("--pdn", nargs="*", default=[], help="PDN files to read games from")
+    parser_build.add_argument("--workers", type=int, default=0, help="processes (0 => one per CPU core)")
+    parser_build.add_argument("--seed", type=int, default=0)
+
+    parser_tune = commands.add_parser("tune", help="fit the weights to a dataset file")
+    parser_tune.add_argument("--data", default="positions.bin")
+    parser_tune.add_argument("--output", default="weights.json")
+    parser_tune.add_argument("--epochs", type=int, default=200)
+    parser_tune.add_argument("--rate", type=float, default=1.0, help="gradient descent step size")
+    parser_tune.add_argument("--k", type=float, default=0.0, help="sigmoid scale (0 => fit it to the material weights)")
+    parser_tune.add_argument("--chunk", type=int, default=1 << 18, help="positions read at a time")
+    parser_tune.add_argument("--workers", type=int, default=0, help="processes (0 => one per CPU core)")
+    parser_tune.add_argument("--verbose", action="store_true", help="print the error and weights of every epoch")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build(args)
+    else:
+        tune(args)
+
+if __name__ == "__main__":
+    main()
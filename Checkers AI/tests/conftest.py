@@ -0,0 +1,5 @@
+# The tests import the checkers and minimax packages the same way main.py does => from the "Checkers AI" directory
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from minimax.alphabeta import AlphaBeta, INF, SIGN
+from minimax.transposition import TranspositionTable
+
+# Plain full-width negamax with the same quiescence rules as AlphaBeta => no pruning, no table, no null windows
+def quiesce(board, color):
+    best = board.evaluate() * SIGN[color]
+    if board.winner() != None:
+        return best
+    other = WHITE if color==RED else RED
+    for move in board.get_capture_list(color):
+        undo = board.apply_move(move)
+        best = max(best, -quiesce(board, other))
+        board.undo_move(undo)
+    return best
+
+def negamax(board, depth, color):
+    if board.winner() != None:
+        return board.evaluate() * SIGN[color]
+    if depth == 0:
+        return quiesce(board, color)
+    other = WHITE if color==RED else RED
+    best = -INF
+    for move in board.get_move_list(color):
+        undo = board.apply_move(move)
+        best = max(best, -negamax(board, depth-1, other))
+        board.undo_move(undo)
+    return best
+
+def random_positions(count, seed):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board, color = Board(), RED
+        for ply in range(rng.randint(0, 50)):
+            moves = board.get_move_list(color)
+            if not moves or board.winner() != None:
+                break
+            board.apply_move(rng.choice(moves))
+            color = WHITE if color==RED else RED
+        if board.winner() == None and board.get_move_list(color):
+            positions.append((board, color))
+    return positions
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_scores_match_negamax_with_quiescence(depth):
+    for board, color in random_positions(30, depth):
+        expected = negamax(board.copy(), depth, color) * SIGN[color]
+        for table in (None, TranspositionTable(1)):
+            score, move = AlphaBeta(table).search(board.copy(), depth, color==WHITE)
+            assert score == expected
+
+def test_best_move_reaches_the_best_score():
+    for board, color in random_positions(20, 7):
+        score, move = AlphaBeta(TranspositionTable(1)).search(board.copy(), 3, color==WHITE)
+        board.apply_move(move)
+        other = WHITE if color==RED else RED
+        assert negamax(board, 2, other) * SIGN[other] == score
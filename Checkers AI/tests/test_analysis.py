@@ -0,0 +1,29 @@
+import io
+
+from checkers.pdn import read_games, write_game
+from minimax import analysis
+
+GAME = '[Event "test"]\n\n1. 11-15 22-18 2. 15x22 25x18 3. 9-99 29-25 1-0\n'
+
+def test_illegal_move_is_not_dropped_silently():
+    analysis._init_worker(1)
+    game = next(read_games(io.StringIO(GAME)))
+    headers, moves, result, plies = analysis.analyze_game(game, 1)
+    assert moves == ["11-15", "22-18", "15x22", "25x18"]
+    assert len(plies) == 4
+    assert result == "*"
+    assert headers["Termination"] == "illegal move 9-99 at ply 5"
+
+    # The written game says where it stopped instead of claiming the original result
+    f = io.StringIO()
+    write_game(f, headers, moves, result)
+    assert '[Termination "illegal move 9-99 at ply 5"]' in f.getvalue()
+    assert f.getvalue().rstrip().endswith("*")
+
+def test_legal_game_keeps_its_result():
+    analysis._init_worker(1)
+    game = next(read_games(io.StringIO(GAME.replace(" 3. 9-99 29-25", ""))))
+    headers, moves, result, plies = analysis.analyze_game(game, 1)
+    assert len(plies) == 4
+    assert result == "1-0"
+    assert "Termination" not in headers
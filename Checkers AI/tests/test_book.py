@@ -0,0 +1,32 @@
+import random
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from minimax.alphabeta import AlphaBeta
+from minimax.book import book_key, self_play_game
+from minimax.transposition import TranspositionTable
+
+# Replay the random opening of self_play_game() => {key: (random move, move the search picks)}
+def opening(seed, depth, random_plies):
+    rng = random.Random(seed)
+    engine = AlphaBeta(TranspositionTable(8))
+    board, color = Board(), RED
+    result = {}
+    for ply in range(random_plies):
+        moves = board.get_move_list(color)
+        evaluation, searched = engine.search(board, depth, color==WHITE)
+        move = rng.choice(moves)
+        result[book_key(board, color)] = (move, searched)
+        board.apply_move(move)
+        color = WHITE if color==RED else RED
+    return result
+
+def test_random_opening_moves_are_not_stored():
+    checked = 0
+    for seed in range(6):
+        expected = opening(seed, 2, 4)
+        for key, move in self_play_game(seed, 2, 4, 4):
+            random_move, searched = expected[key]
+            assert move == searched
+            checked += random_move != searched
+    assert checked                  # at least one random move differed from the search and was left out
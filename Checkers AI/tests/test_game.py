@@ -0,0 +1,43 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from checkers.constants import HEIGHT, RED, WHITE, WIDTH
+from checkers.game import Game
+from checkers.player import NO_MOVE
+from minimax.player import AIPlayer
+
+# White man on bit 27 with the red man on bit 31 in front of it => white has a piece left but no move
+BLOCKED = (1 << 31, 1 << 27, 0)
+
+def blocked_game():
+    game = Game(pygame.display.set_mode((WIDTH, HEIGHT)))
+    game.board.set_position(*BLOCKED)
+    game.turn = WHITE
+    return game
+
+def test_side_without_a_move_loses():
+    game = blocked_game()
+    assert game.board.winner() == None
+    assert game.winner() == RED
+
+def test_ai_without_a_move_says_so():
+    game = blocked_game()
+    ai = AIPlayer(WHITE, 100, use_process=False)
+    try:
+        ai.start(game.get_board()).result()
+        assert ai.get_move() is NO_MOVE
+    finally:
+        ai.shutdown()
+
+def test_play_ends_when_the_ai_is_blocked():
+    game = blocked_game()
+    players = {color: AIPlayer(color, 100, use_process=False) for color in (RED, WHITE)}
+    try:
+        assert game.play(players) == RED
+        assert game.board.red == BLOCKED[0] and game.board.white == BLOCKED[1]
+    finally:
+        for player in players.values():
+            player.shutdown()
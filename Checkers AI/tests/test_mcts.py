@@ -0,0 +1,29 @@
+import random
+import threading
+import time
+
+from checkers.board import Board
+from checkers.constants import RED
+from minimax.mcts import MCTS, playout
+
+def test_stop_reaches_the_workers():
+    engine = MCTS(workers=2, seed=0)
+    try:
+        engine.think(Board(), False, 200)                   # start the pool before timing the stop
+        thread = threading.Thread(target=engine.think, args=(Board(), False, 60000))
+        thread.start()
+        time.sleep(0.5)
+        start = time.time()
+        engine.stop()
+        thread.join(10)
+        assert not thread.is_alive()
+        assert time.time() - start < 5
+    finally:
+        engine.stop()
+        engine.close()
+
+def test_playout_leaves_the_move_cache_alone():
+    board = Board()
+    Board.move_cache.clear()
+    playout(board.copy(), RED, random.Random(0))
+    assert len(Board.move_cache) == 0
@@ -0,0 +1,42 @@
+import threading
+import time
+from collections import OrderedDict
+
+from checkers.board import Board
+from checkers.constants import RED
+from checkers.movecache import MoveCache
+
+# Entries that hand the processor to another thread in the middle of every lookup => the eviction that could happen
+# there by chance happens every time
+class SlowEntries(OrderedDict):
+    def get(self, key, default=None):
+        entry = super().get(key, default)
+        time.sleep(0.0001)
+        return entry
+
+# Three positions in a cache of two used by several threads => entries are evicted while others look them up
+def test_threads_share_one_cache():
+    cache = MoveCache(2)
+    cache.entries = SlowEntries()
+    boards = [Board() for i in range(3)]
+    for i, board in enumerate(boards):
+        board.apply_move(board.get_move_list(RED)[i])
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(300):
+                board = boards[(i + offset) % len(boards)]
+                key = MoveCache.key(board, False, False)
+                if cache.get(key, board) is None:
+                    cache.put(key, board, [])
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) <= 2
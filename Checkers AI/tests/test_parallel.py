@@ -0,0 +1,20 @@
+import pytest
+
+from checkers.constants import WHITE
+from minimax.alphabeta import AlphaBeta
+from minimax.parallel import ParallelSearch
+
+from test_alphabeta import random_positions
+
+@pytest.fixture(scope="module")
+def parallel():
+    search = ParallelSearch(workers=2)
+    yield search
+    search.close()
+
+# Quiescence is on in both => the parallel search has to give the serial score and move
+@pytest.mark.parametrize("depth", [2, 3, 4])
+def test_parallel_matches_serial(parallel, depth):
+    for board, color in random_positions(10, 100 + depth):
+        serial = AlphaBeta().search(board.copy(), depth, color==WHITE)
+        assert parallel.search(board.copy(), depth, color==WHITE) == serial
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from checkers.pdn import parse_fen, square_to_bit
+from minimax import mcts
+from minimax.protocol import Session
+
+# Session that keeps its replies in a list
+@pytest.fixture
+def session():
+    lines = []
+    session = Session(lines.append)
+    session.lines = lines
+    yield session
+    session.close()
+
+@pytest.mark.parametrize("number", [0, 33, 99, -1])
+def test_square_outside_the_board(number):
+    with pytest.raises(ValueError, match="not between 1 and 32"):
+        square_to_bit(number)
+
+@pytest.mark.parametrize("text", ["X:W21:B1", ":W21:B1", "BW:W21:B1", "B:W21:X1", "B:W21:B1,K", "B:W99:B1"])
+def test_bad_fen(text):
+    with pytest.raises(ValueError):
+        parse_fen(text)
+
+@pytest.mark.parametrize("move", ["11-99", "0-15", "33x24", "11-", "a-b"])
+def test_move_outside_the_board(session, move):
+    session.command("position startpos moves %s" % move)
+    assert len(session.lines) == 1
+    assert session.lines[0].startswith("error ")
+    assert "shift" not in session.lines[0]
+
+@pytest.mark.parametrize("side", ["", "X", "BW"])
+def test_fen_side_must_be_b_or_w(session, side):
+    session.command("position fen %s:W21,22:B1,2" % side)
+    assert session.lines == ["error bad FEN '%s:W21,22:B1,2'" % side]
+
+def test_good_position_is_kept(session):
+    session.command("position fen W:W21,22:B1,K5 moves 22-18")
+    assert session.lines == []
+    assert session.color == (255, 0, 0)
+
+# Without a limit MCTS must not stop after its default number of playouts => only stop ends the search
+def test_mcts_go_infinite_waits_for_stop(monkeypatch):
+    monkeypatch.setattr(mcts, "DEFAULT_ROLLOUTS", 8)
+    lines = []
+    session = Session(lines.append, engine="mcts")
+    try:
+        session.command("go infinite")
+        time.sleep(0.5)
+        assert not [line for line in lines if line.startswith("bestmove")]
+        session.command("stop")
+        assert lines[-1].startswith("bestmove ") and lines[-1] != "bestmove none"
+    finally:
+        session.close()
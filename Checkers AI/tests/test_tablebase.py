@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from checkers.board import Board
+from checkers.constants import RED
+from minimax.alphabeta import AlphaBeta, INF
+from minimax.tablebase import TB_WIN, Tablebase, generate, generation_order
+from minimax.transposition import TranspositionTable
+
+# Tablebase of every position with 2 pieces => generated in well under a second
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("tablebase"))
+    for level in generation_order(2):
+        for sig in level:
+            generate(directory, sig)
+    tablebase = Tablebase(directory)
+    yield tablebase
+    tablebase.close()
+
+# Red king on bit 1 against a white man on bit 7, red to move => both moves of the king win, in 8 and in 4 more plies
+KING, MAN = 1 << 1, 1 << 7
+LONG_WIN, SHORT_WIN = (2, 32, 0), (2, 64, 0)
+
+@pytest.mark.parametrize("size_mb", [None, 1])
+def test_shorter_win_scores_higher(tablebase, size_mb):
+    board = Board()
+    board.set_position(KING, MAN, KING)
+    assert tablebase.probe(board, RED) == (1, 5)
+
+    def engine():
+        return AlphaBeta(TranspositionTable(size_mb) if size_mb else None, tablebase=tablebase, quiescence=False)
+
+    # Scores count the plies from the root => the move itself plus the distance the tablebase stores after it
+    assert engine().score_move(board, LONG_WIN, 4, -INF, INF, RED) == TB_WIN - 1 - 8
+    assert engine().score_move(board, SHORT_WIN, 4, -INF, INF, RED) == TB_WIN - 1 - 4
+    assert engine().search(board, 4, False) == (-(TB_WIN - 1 - 4), SHORT_WIN)
+
+# A win stored in the transposition table counts from the position itself => found again one ply further from the
+# root, it has to score like a search without the table finds it there (one ply less for a win, one more for a loss)
+def test_table_keeps_the_distance_of_wins(tablebase):
+    rng = random.Random(0)
+    checked = 0
+    while checked < 20:
+        squares = rng.sample(range(32), 3)
+        red, white = 1 << squares[0] | 1 << squares[1], 1 << squares[2]
+        kings = sum(1 << square for square in squares if rng.random() < 0.5)
+        board = Board()
+        board.set_position(red, white, kings)
+        if board.winner() != None:
+            continue
+
+        for move in board.get_move_list(RED):
+            if move[2]:
+                continue                # a capture would reach the tablebase, which is probed before the table
+            expected = AlphaBeta(None, tablebase=tablebase, quiescence=False).score_move(board, move, 5, -INF, INF, RED)
+            if abs(expected) == INF or abs(expected) < TB_WIN // 2:
+                continue
+
+            # Position after the move searched as the root (ply 0), then reached from the move (ply 1)
+            engine = AlphaBeta(TranspositionTable(1), tablebase=tablebase, quiescence=False)
+            undo = board.apply_move(move)
+            engine.search(board, 4, True)
+            board.undo_move(undo)
+            assert engine.score_move(board, move, 5, -INF, INF, RED) == expected
+            checked += 1
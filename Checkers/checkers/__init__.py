@@ -1,2 +0,0 @@
-# Initialize the checkers folder as a package
-# Allow to import stuff directly from this package